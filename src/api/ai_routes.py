@@ -5,6 +5,7 @@ Parse natural language and execute actions
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any
+import asyncio
 import logging
 
 from ..ai.intent_parser import IntentParser, Intent
@@ -298,11 +299,11 @@ async def _execute_action(
             wallet_manager = request.app.state.wallet_manager
             web3_manager = request.app.state.web3_manager
             
-            if not wallet_manager.current_wallet:
+            address = wallet_manager.get_current_wallet()
+            if not address:
                 raise HTTPException(status_code=400, detail="No wallet loaded")
             
-            address = wallet_manager.current_wallet.address
-            balance = web3_manager.get_balance(address)
+            balance = await asyncio.to_thread(web3_manager.get_balance, address)
             balance_ether = web3_manager.wei_to_ether(balance)
             
             return {
@@ -336,7 +337,7 @@ async def _execute_action(
         elif intent == Intent.CREATE_WALLET.value:
             # Use wallet create endpoint
             wallet_manager = request.app.state.wallet_manager
-            wallet_info = wallet_manager.create_wallet(params['wallet_name'])
+            wallet_info = await wallet_manager.acreate_wallet(params['wallet_name'])
             
             return {
                 "type": "wallet",
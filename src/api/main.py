@@ -5,6 +5,7 @@ Phase 1: Core FastAPI setup with Web3 integration
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import os
 
@@ -156,12 +157,12 @@ async def health_check():
     """Health check endpoint"""
     try:
         # Check Web3 connection
-        is_connected = web3_manager and web3_manager.is_connected()
+        is_connected = web3_manager and await asyncio.to_thread(web3_manager.is_connected)
         
         return {
             "status": "healthy" if is_connected else "degraded",
             "web3_connected": is_connected,
-            "network": web3_manager.get_network_info() if is_connected else None
+            "network": await asyncio.to_thread(web3_manager.get_network_info) if is_connected else None
         }
     except Exception as e:
         logger.error(f"Health check failed: {e}")
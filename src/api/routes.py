@@ -5,6 +5,7 @@ Phase 1: Core wallet and balance endpoints
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, Field
 from typing import Optional
+import asyncio
 import logging
 from ..execution.sandbox_mode import (
     is_sandbox_mode,
@@ -66,12 +67,12 @@ async def create_wallet(request: Request, body: WalletCreateRequest):
     """
     Create a new wallet with encrypted private key storage
     
-    **Security**: Private keys are encrypted using PBKDF2 + Fernet encryption
+    **Security**: Private keys are encrypted using scrypt + AES-256-GCM
     """
     try:
         wallet_manager = request.app.state.wallet_manager
         
-        result = wallet_manager.create_wallet(body.wallet_name)
+        result = await wallet_manager.acreate_wallet(body.wallet_name)
         
         return WalletCreateResponse(
             wallet_name=result["wallet_name"],
@@ -95,7 +96,7 @@ async def import_wallet(request: Request, body: WalletImportRequest):
     try:
         wallet_manager = request.app.state.wallet_manager
         
-        result = wallet_manager.import_wallet(body.wallet_name, body.private_key)
+        result = await wallet_manager.aimport_wallet(body.wallet_name, body.private_key)
         
         return WalletCreateResponse(
             wallet_name=result["wallet_name"],
@@ -118,7 +119,7 @@ async def load_wallet(request: Request, body: WalletLoadRequest):
     try:
         wallet_manager = request.app.state.wallet_manager
         
-        result = wallet_manager.load_wallet(body.wallet_name)
+        result = await wallet_manager.aload_wallet(body.wallet_name)
         
         return {
             "wallet_name": result["wallet_name"],
@@ -191,7 +192,7 @@ async def get_balance(
     try:
         wallet_manager = request.app.state.wallet_manager
         
-        balance_info = wallet_manager.get_balance(address)
+        balance_info = await asyncio.to_thread(wallet_manager.get_balance, address)
         
         return BalanceResponse(**balance_info)
     except ValueError as e:
@@ -220,7 +221,7 @@ async def get_transaction_history(
     try:
         wallet_manager = request.app.state.wallet_manager
         
-        history = wallet_manager.get_transaction_history(address, limit)
+        history = await asyncio.to_thread(wallet_manager.get_transaction_history, address, limit)
         
         return TransactionHistoryResponse(**history)
     except ValueError as e:
@@ -242,7 +243,7 @@ async def get_network_info(request: Request):
         if not web3_manager.is_connected():
             raise HTTPException(status_code=503, detail="Web3 not connected")
         
-        return web3_manager.get_network_info()
+        return await asyncio.to_thread(web3_manager.get_network_info)
     except HTTPException:
         raise
     except Exception as e:
@@ -316,7 +317,8 @@ async def estimate_transaction(request: Request, body: TransactionEstimateReques
             return estimate
         
         # Simulate transaction
-        simulation = transaction_builder.simulate_transaction(
+        simulation = await asyncio.to_thread(
+            transaction_builder.simulate_transaction,
             current_address,
             body.to_address,
             value_wei,
@@ -363,10 +365,10 @@ async def send_transaction(
         rule_engine = request.app.state.rule_engine
         
         # Get current wallet
-        if not wallet_manager.current_wallet:
+        current_address = wallet_manager.get_current_wallet()
+        if not current_address:
             raise HTTPException(status_code=400, detail="No wallet loaded")
         
-        current_address = wallet_manager.current_wallet.address
         from web3 import Web3
         checksum_to = Web3.to_checksum_address(body.to_address)
         
@@ -461,19 +463,24 @@ async def send_transaction(
         # Convert ETH to wei
         value_wei = web3_manager.ether_to_wei(body.value)
         
-        # Build transaction
-        transaction = transaction_builder.build_transaction(
-            from_address=current_address,
-            to_address=checksum_to,
-            value=value_wei,
-            gas_limit=body.gas_limit
-        )
-        
-        # Sign transaction
-        signed_tx = wallet_manager.sign_transaction(transaction)
-        
-        # Send transaction
-        tx_hash = await web3_manager.broadcast_raw_transaction(signed_tx)
+        try:
+            # Build transaction
+            transaction = await transaction_builder.abuild_transaction(
+                from_address=current_address,
+                to_address=checksum_to,
+                value=value_wei,
+                gas_limit=body.gas_limit
+            )
+            
+            # Sign transaction
+            signed_tx = await wallet_manager.asign_transaction(transaction)
+            
+            # Send transaction
+            tx_hash = await web3_manager.broadcast_raw_transaction(signed_tx)
+        except Exception:
+            # A reserved nonce was not consumed; resync on the next build
+            transaction_builder.reset_nonce(current_address)
+            raise
         
         # Log to database
         audit_logger.log_transaction(
@@ -493,7 +500,7 @@ async def send_transaction(
             "value": body.value
         })
         
-        network_info = web3_manager.get_network_info()
+        network_info = await asyncio.to_thread(web3_manager.get_network_info)
         explorer_url = f"{network_info.get('explorer', 'https://polygonscan.com')}/tx/{tx_hash}"
         
         return {
@@ -528,7 +535,7 @@ async def get_transaction_status(request: Request, tx_hash: str):
         
         # Try to get receipt from blockchain
         try:
-            receipt = web3_manager.get_transaction_receipt(tx_hash)
+            receipt = await asyncio.to_thread(web3_manager.get_transaction_receipt, tx_hash)
             
             if receipt:
                 status = "CONFIRMED" if receipt.get('status') == 1 else "FAILED"
@@ -600,7 +607,7 @@ async def get_token_balance(request: Request, token_address: str):
             raise HTTPException(status_code=400, detail="No wallet loaded")
         
         # Get token balance
-        balance_info = token_manager.get_token_balance(current_address, token_address)
+        balance_info = await asyncio.to_thread(token_manager.get_token_balance, current_address, token_address)
         
         return balance_info
         
@@ -629,18 +636,24 @@ async def transfer_token(request: Request, body: TokenTransferRequest):
             raise HTTPException(status_code=400, detail="No wallet loaded")
         
         # Build token transfer transaction
-        tx_data = token_manager.build_transfer_transaction(
+        tx_data = await asyncio.to_thread(
+            token_manager.build_transfer_transaction,
             current_address,
             body.to_address,
             body.token_address,
             body.amount
         )
         
-        # Sign transaction
-        signed_tx = wallet_manager.sign_transaction(tx_data['transaction'])
-        
-        # Send transaction
-        tx_hash = wallet_manager.send_transaction(signed_tx)
+        try:
+            # Sign transaction
+            signed_tx = await wallet_manager.asign_transaction(tx_data['transaction'])
+            
+            # Send transaction
+            tx_hash = await asyncio.to_thread(wallet_manager.send_transaction, signed_tx)
+        finally:
+            # The token builder fetched its own nonce; the transaction
+            # builder's local counter for this sender is now stale
+            request.app.state.transaction_builder.reset_nonce(current_address)
         
         # Log to database
         audit_logger.log_transaction(
@@ -684,18 +697,24 @@ async def approve_token(request: Request, body: TokenApproveRequest):
             raise HTTPException(status_code=400, detail="No wallet loaded")
         
         # Build approval transaction
-        tx_data = token_manager.build_approve_transaction(
+        tx_data = await asyncio.to_thread(
+            token_manager.build_approve_transaction,
             current_address,
             body.spender_address,
             body.token_address,
             body.amount
         )
         
-        # Sign transaction
-        signed_tx = wallet_manager.sign_transaction(tx_data['transaction'])
-        
-        # Send transaction
-        tx_hash = wallet_manager.send_transaction(signed_tx)
+        try:
+            # Sign transaction
+            signed_tx = await wallet_manager.asign_transaction(tx_data['transaction'])
+            
+            # Send transaction
+            tx_hash = await asyncio.to_thread(wallet_manager.send_transaction, signed_tx)
+        finally:
+            # The token builder fetched its own nonce; the transaction
+            # builder's local counter for this sender is now stale
+            request.app.state.transaction_builder.reset_nonce(current_address)
         
         return {
             "tx_hash": tx_hash,
@@ -215,8 +215,9 @@ async def evaluate_transaction(
         # Get from_address if not provided
         if not from_address:
             # Try to get from current wallet
-            if wallet_manager.current_wallet:
-                from_address = wallet_manager.current_wallet.address
+            current_address = wallet_manager.get_current_wallet()
+            if current_address:
+                from_address = current_address
             else:
                 # Use a dummy address for evaluation if no wallet loaded
                 from_address = "0x0000000000000000000000000000000000000000"
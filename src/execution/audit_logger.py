@@ -10,6 +10,15 @@ from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Slim projection used by the pending-transaction poller
+_SQL_PENDING = """
+    SELECT tx_hash, from_address, to_address, value, status, timestamp
+    FROM transactions
+    WHERE status = ?
+    ORDER BY timestamp DESC
+    LIMIT 100
+"""
+
 
 class AuditLogger:
     """
@@ -77,6 +86,18 @@ class AuditLogger:
                 CREATE INDEX IF NOT EXISTS idx_status 
                 ON transactions(status)
             """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_tx_status_ts
+                ON transactions(status, timestamp)
+            """)
+            # Per-sender windows read by the rule engine's context query; the
+            # status column lets it filter without touching the table rows.
+            # idx_tx_from_ts was a strict prefix of this index.
+            cursor.execute("DROP INDEX IF EXISTS idx_tx_from_ts")
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_tx_from_ts_status
+                ON transactions(from_address, timestamp, status)
+            """)
             
             # Events table
             cursor.execute("""
@@ -249,11 +270,19 @@ class AuditLogger:
             return [dict(row) for row in rows]
     
     def get_pending_transactions(self) -> List[Dict[str, Any]]:
-        """Get all pending/submitted transactions"""
-        return self.get_transaction_history(
-            status="SUBMITTED",
-            limit=100
-        )
+        """
+        Get all pending/submitted transactions
+        
+        Uses a fixed query with a slim projection (served by the
+        status/timestamp index) instead of the generic history query.
+        
+        Returns:
+            list: Up to 100 most recent SUBMITTED transactions
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(_SQL_PENDING, ("SUBMITTED",)).fetchall()
+            return [dict(row) for row in rows]
     
     def get_events(
         self,
@@ -56,12 +56,42 @@ class SandboxWeb3Manager:
             self.balances[address] = 100000000000000000000  # 100 ETH in wei
         return self.balances[address]
     
-    def get_transaction_count(self, address: str) -> int:
+    def get_transaction_count(self, address: str, block_identifier: str = "latest") -> int:
         """Return simulated nonce"""
         if address not in self.nonces:
             self.nonces[address] = 0
         return self.nonces[address]
     
+    def batch_preflight(
+        self,
+        from_address: str,
+        to_address: str,
+        value: int = 0,
+        data: str = "0x"
+    ) -> Dict[str, Optional[int]]:
+        """Return simulated nonce, gas estimate and gas price"""
+        return {
+            "nonce": self.get_transaction_count(from_address),
+            "gas": 21000,
+            "gas_price": 20000000000  # 20 gwei
+        }
+    
+    async def aget_balance(self, address: str) -> int:
+        """Return simulated balance"""
+        return self.get_balance(address)
+    
+    async def aget_transaction_count(self, address: str, block_identifier: str = "latest") -> int:
+        """Return simulated nonce"""
+        return self.get_transaction_count(address)
+    
+    async def aestimate_gas(self, transaction: Dict[str, Any]) -> int:
+        """Return reasonable gas estimate"""
+        return 21000
+    
+    async def aget_gas_price(self) -> int:
+        """Return simulated gas price (20 gwei)"""
+        return 20000000000
+    
     def wei_to_ether(self, wei: int) -> float:
         """Convert wei to ether"""
         return float(wei) / 1e18
@@ -95,7 +125,7 @@ class SandboxWeb3Manager:
                 return 21000
             
             @staticmethod
-            def get_transaction_count(address):
+            def get_transaction_count(address, block_identifier="latest"):
                 return 0
             
             @property
@@ -4,21 +4,39 @@ Handles wallet creation, encryption, and secure key storage
 """
 import os
 import json
+import asyncio
+import hashlib
 import logging
+import tempfile
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from eth_account import Account
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from dotenv import load_dotenv
 import base64
 
+try:
+    import orjson  # Optional: faster wallet serialization
+except ImportError:
+    orjson = None
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of derived keys kept in memory per WalletManager
+KDF_CACHE_SIZE = 64
+
+# KDF parameters for new wallets (scrypt, ~100ms, 32 MiB)
+SCRYPT_PARAMS = {"n": 2 ** 15, "r": 8, "p": 1}
+
+# Wallet file format written by this version (AES-256-GCM over a scrypt key)
+WALLET_VERSION = "3.0"
+WALLET_CIPHER = "aes-256-gcm"
+
 
 class WalletManager:
     """
@@ -49,27 +67,179 @@ class WalletManager:
             self.master_password = "changeme_insecure_default"
         
         self.current_wallet: Optional[Account] = None
+        self.current_wallet_name: Optional[str] = None
+        self.current_wallet_address: Optional[str] = None
+        
+        # Parsed wallet JSON per file, reused while the file's mtime is unchanged
+        self._json_cache: Dict[Path, Tuple[int, Dict[str, Any]]] = {}
+        
+        # Decrypted key of an unlocked AES-GCM wallet, turned into an Account on first signature
+        self._pending_pk: Optional[bytes] = None
+        
+        # Derived key cache: sha256(password + salt) -> derived key (LRU)
+        self._kdf_cache: "OrderedDict[bytes, bytearray]" = OrderedDict()
+        self._kdf_lock = threading.Lock()
         logger.info(f"Wallet manager initialized. Storage: {self.wallet_dir}")
     
-    def _derive_key(self, password: str, salt: bytes) -> bytes:
+    @property
+    def w3(self):
+        """Web3 instance for one RPC operation, round-robin from the manager's pool"""
+        acquire = getattr(self.web3_manager, "acquire", None)
+        return acquire() if acquire else self.web3_manager.w3
+    
+    def _derive_key(
+        self,
+        password: str,
+        salt: bytes,
+        kdf: str = "pbkdf2",
+        params: Optional[Dict[str, int]] = None
+    ) -> bytes:
         """
-        Derive encryption key from password using PBKDF2
+        Derive encryption key from password using scrypt or PBKDF2
+        
+        Derived keys are cached in memory (bounded LRU) so repeated loads
+        of the same wallet skip the KDF.
         
         Args:
             password: Master password
             salt: Salt for key derivation
+            kdf: "scrypt" (current wallets) or "pbkdf2" (version 1.0 wallets)
+            params: scrypt parameters (n, r, p)
+            
+        Returns:
+            bytes: Derived 32-byte key
+        """
+        params = params or {}
+        cache_key = hashlib.sha256(
+            f"{kdf}:{params.get('n')}:{params.get('r')}:{params.get('p')}:".encode()
+            + password.encode()
+            + salt
+        ).digest()
+        
+        with self._kdf_lock:
+            cached = self._kdf_cache.get(cache_key)
+            if cached is not None:
+                self._kdf_cache.move_to_end(cache_key)
+                return bytes(cached)
+        
+        if kdf == "scrypt":
+            n, r, p = params["n"], params["r"], params["p"]
+            raw = hashlib.scrypt(
+                password.encode(),
+                salt=salt,
+                n=n,
+                r=r,
+                p=p,
+                maxmem=256 * r * (n + p),  # OpenSSL's 32 MiB default is too tight
+                dklen=32
+            )
+        elif kdf == "pbkdf2":
+            # hashlib calls OpenSSL's PBKDF2 directly (no hazmat object wrapper)
+            raw = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, 100000, dklen=32)
+        else:
+            raise ValueError(f"Unsupported KDF: {kdf}")
+        
+        with self._kdf_lock:
+            self._kdf_cache[cache_key] = bytearray(raw)
+            self._kdf_cache.move_to_end(cache_key)
+            while len(self._kdf_cache) > KDF_CACHE_SIZE:
+                _, evicted = self._kdf_cache.popitem(last=False)
+                evicted[:] = bytes(len(evicted))
+        
+        return raw
+    
+    def _encrypt_private_key(self, private_key: bytes) -> Dict[str, Any]:
+        """
+        Encrypt a private key with AES-256-GCM under a fresh salt and nonce
+        
+        Args:
+            private_key: Private key bytes to encrypt
+            
+        Returns:
+            dict: Encryption fields of the wallet JSON
+        """
+        salt = os.urandom(16)
+        nonce = os.urandom(12)
+        encryption_key = self._derive_key(self.master_password, salt, "scrypt", SCRYPT_PARAMS)
+        ciphertext = AESGCM(encryption_key).encrypt(nonce, private_key, None)
+        
+        return {
+            "encrypted_private_key": base64.b64encode(ciphertext).decode(),
+            "nonce": base64.b64encode(nonce).decode(),
+            "salt": salt.hex(),
+            "version": WALLET_VERSION,
+            "cipher": WALLET_CIPHER,
+            "kdf": "scrypt",
+            **SCRYPT_PARAMS
+        }
+    
+    def _decrypt_private_key(self, wallet_data: Dict[str, Any]) -> bytes:
+        """
+        Decrypt the private key stored in wallet JSON
+        
+        Version 3.0 wallets use AES-256-GCM; older wallets use Fernet.
+        
+        Args:
+            wallet_data: Wallet JSON content
             
         Returns:
-            bytes: Derived key
+            bytes: Decrypted private key
+        """
+        try:
+            salt = bytes.fromhex(wallet_data["salt"])
+        except ValueError:
+            salt = base64.b64decode(wallet_data["salt"])  # wallets written before hex salts
+        kdf = wallet_data.get("kdf", "pbkdf2")  # version 1.0 wallets use PBKDF2
+        params = (
+            {k: wallet_data[k] for k in ("n", "r", "p")} if kdf == "scrypt" else None
+        )
+        encryption_key = self._derive_key(self.master_password, salt, kdf, params)
+        
+        if wallet_data.get("cipher") == WALLET_CIPHER:
+            nonce = base64.b64decode(wallet_data["nonce"])
+            ciphertext = base64.b64decode(wallet_data["encrypted_private_key"])
+            return AESGCM(encryption_key).decrypt(nonce, ciphertext, None)
+        
+        cipher = Fernet(base64.urlsafe_b64encode(encryption_key))
+        return cipher.decrypt(wallet_data["encrypted_private_key"].encode())
+    
+    def _write_wallet_file(self, wallet_path: Path, wallet_data: Dict[str, Any]):
+        """
+        Atomically write wallet data to disk
+        
+        Writes to a uniquely named temporary file in the wallet directory,
+        fsyncs it and renames it over the target, so neither a crash nor a
+        concurrent write leaves a half-written wallet file.
+        
+        Args:
+            wallet_path: Destination wallet file
+            wallet_data: Wallet JSON content
         """
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-            backend=default_backend()
+        if orjson is not None:
+            content = orjson.dumps(wallet_data, option=orjson.OPT_INDENT_2)
+        else:
+            content = json.dumps(wallet_data, indent=2).encode()
+        
+        tmp = tempfile.NamedTemporaryFile(
+            dir=wallet_path.parent, prefix=f".{wallet_path.stem}.", suffix=".tmp", delete=False
         )
-        return base64.urlsafe_b64encode(kdf.derive(password.encode()))
+        try:
+            with tmp:
+                tmp.write(content)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.replace(tmp.name, wallet_path)
+        except BaseException:
+            Path(tmp.name).unlink(missing_ok=True)
+            raise
+        
+        # Persist the rename itself (directories cannot be opened on Windows)
+        if os.name == "posix":
+            dir_fd = os.open(wallet_path.parent, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
     
     def import_wallet(self, wallet_name: str, private_key: str) -> Dict[str, Any]:
         """
@@ -85,38 +255,27 @@ class WalletManager:
         try:
             logger.info(f"Importing wallet: {wallet_name}")
             
-            # Clean private key (remove 0x if present)
-            if private_key.startswith('0x'):
-                private_key = private_key[2:]
+            # Decode private key once to raw bytes (remove 0x if present)
+            pk_bytes = bytes.fromhex(private_key.removeprefix('0x'))
             
             # Create account from private key
-            account = Account.from_key(private_key)
+            account = Account.from_key(pk_bytes)
             
-            # Generate salt for encryption
-            salt = os.urandom(16)
-            
-            # Derive encryption key
-            encryption_key = self._derive_key(self.master_password, salt)
-            cipher = Fernet(encryption_key)
-            
-            # Encrypt private key
-            encrypted_key = cipher.encrypt(('0x' + private_key).encode())
-            
-            # Prepare wallet data
+            # Encrypt private key and prepare wallet data
             wallet_data = {
                 "address": account.address,
-                "encrypted_private_key": encrypted_key.decode(),
-                "salt": base64.b64encode(salt).decode(),
-                "version": "1.0"
+                **self._encrypt_private_key(pk_bytes)
             }
             
             # Save to file
             wallet_path = self.wallet_dir / f"{wallet_name}.json"
-            with open(wallet_path, 'w') as f:
-                json.dump(wallet_data, f, indent=2)
+            self._write_wallet_file(wallet_path, wallet_data)
             
             # Set as current wallet
             self.current_wallet = account
+            self._pending_pk = None
+            self.current_wallet_name = wallet_name
+            self.current_wallet_address = account.address
             
             logger.info(f"Wallet imported successfully: {account.address}")
             
@@ -153,31 +312,21 @@ class WalletManager:
             # Generate new account
             account = Account.create()
             
-            # Generate salt for encryption
-            salt = os.urandom(16)
-            
-            # Derive encryption key
-            encryption_key = self._derive_key(self.master_password, salt)
-            cipher = Fernet(encryption_key)
-            
-            # Encrypt private key
-            encrypted_key = cipher.encrypt(account.key.hex().encode())
-            
-            # Prepare wallet data
+            # Encrypt private key and prepare wallet data
             wallet_data = {
                 "address": account.address,
-                "encrypted_private_key": encrypted_key.decode(),
-                "salt": base64.b64encode(salt).decode(),
-                "version": "1.0"
+                **self._encrypt_private_key(bytes(account.key))
             }
             
             # Save to file
             wallet_path = self.wallet_dir / f"{wallet_name}.json"
-            with open(wallet_path, 'w') as f:
-                json.dump(wallet_data, f, indent=2)
+            self._write_wallet_file(wallet_path, wallet_data)
             
             # Set as current wallet
             self.current_wallet = account
+            self._pending_pk = None
+            self.current_wallet_name = wallet_name
+            self.current_wallet_address = account.address
             
             logger.info(f"Wallet created successfully: {account.address}")
             
@@ -192,10 +341,42 @@ class WalletManager:
             logger.error(f"Failed to create wallet: {e}")
             raise
     
+    def _read_wallet_file(self, wallet_name: str) -> Dict[str, Any]:
+        """
+        Read and parse a wallet file, cached until the file changes on disk
+        
+        Args:
+            wallet_name: Name of the wallet
+            
+        Returns:
+            dict: Wallet JSON content
+        """
+        wallet_path = self.wallet_dir / f"{wallet_name}.json"
+        
+        try:
+            mtime = wallet_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Wallet not found: {wallet_name}")
+        
+        cached = self._json_cache.get(wallet_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
+        # Read encrypted wallet data
+        with open(wallet_path, 'r') as f:
+            wallet_data = json.load(f)
+        
+        self._json_cache[wallet_path] = (mtime, wallet_data)
+        return wallet_data
+    
     def load_wallet(self, wallet_name: str = "default") -> Dict[str, Any]:
         """
         Load an existing wallet from encrypted storage
         
+        The private key is decrypted eagerly so a wrong password or a
+        tampered file is rejected here rather than at the first signature;
+        the derived-key cache keeps repeat loads of the same wallet cheap.
+        
         Args:
             wallet_name: Name of the wallet to load
             
@@ -203,49 +384,87 @@ class WalletManager:
             dict: Wallet information
         """
         try:
-            wallet_path = self.wallet_dir / f"{wallet_name}.json"
-            
-            if not wallet_path.exists():
-                raise FileNotFoundError(f"Wallet not found: {wallet_name}")
-            
             logger.info(f"Loading wallet: {wallet_name}")
             
-            # Read encrypted wallet data
-            with open(wallet_path, 'r') as f:
-                wallet_data = json.load(f)
-            
-            # Decrypt private key
-            salt = base64.b64decode(wallet_data["salt"])
-            encryption_key = self._derive_key(self.master_password, salt)
-            cipher = Fernet(encryption_key)
-            
-            encrypted_key = wallet_data["encrypted_private_key"].encode()
-            private_key = cipher.decrypt(encrypted_key).decode()
+            wallet_info = self.unlock_wallet(wallet_name)
             
-            # Create account from private key
-            account = Account.from_key(private_key)
+            logger.info(f"Wallet loaded successfully: {wallet_info['address']}")
             
-            # Verify address matches
-            if account.address != wallet_data["address"]:
-                raise ValueError("Address mismatch - wallet may be corrupted")
+            return wallet_info
             
-            self.current_wallet = account
+        except Exception as e:
+            logger.error(f"Failed to load wallet: {e}")
+            raise
+    
+    def unlock_wallet(self, wallet_name: str = "default") -> Dict[str, Any]:
+        """
+        Decrypt a wallet's private key and make it the current wallet
+        
+        For AES-GCM wallets the cipher authenticates the key, so it is kept
+        pending and the Account (secp256k1 public key derivation) is only
+        built, and checked against the stored address, when sign_transaction
+        needs it. Older wallets are rebuilt and checked immediately.
+        
+        Args:
+            wallet_name: Name of the wallet to unlock
             
-            logger.info(f"Wallet loaded successfully: {account.address}")
+        Returns:
+            dict: Wallet information
+        """
+        try:
+            wallet_data = self._read_wallet_file(wallet_name)
+            
+            logger.info(f"Unlocking wallet: {wallet_name}")
+            
+            # Decrypt private key (raw 32 bytes; older wallets hold hex text)
+            private_key = self._decrypt_private_key(wallet_data)
+            if len(private_key) != 32:
+                private_key = bytes.fromhex(private_key.decode().removeprefix('0x'))
+            
+            if wallet_data.get("cipher") == WALLET_CIPHER:
+                self.current_wallet = None
+                self._pending_pk = private_key
+            else:
+                # Create account from private key
+                account = Account.from_key(private_key)
+                
+                # Verify address matches
+                if account.address != wallet_data["address"]:
+                    raise ValueError("Address mismatch - wallet may be corrupted")
+                
+                self.current_wallet = account
+                self._pending_pk = None
+            
+            self.current_wallet_name = wallet_name
+            self.current_wallet_address = wallet_data["address"]
+            
+            logger.info(f"Wallet unlocked: {wallet_data['address']}")
             
             return {
                 "wallet_name": wallet_name,
-                "address": account.address,
+                "address": wallet_data["address"],
                 "network": self.web3_manager.network
             }
             
         except Exception as e:
-            logger.error(f"Failed to load wallet: {e}")
+            logger.error(f"Failed to unlock wallet: {e}")
             raise
     
+    async def acreate_wallet(self, wallet_name: str = "default") -> Dict[str, Any]:
+        """Async create_wallet; runs the KDF in a worker thread"""
+        return await asyncio.to_thread(self.create_wallet, wallet_name)
+    
+    async def aimport_wallet(self, wallet_name: str, private_key: str) -> Dict[str, Any]:
+        """Async import_wallet; runs the KDF in a worker thread"""
+        return await asyncio.to_thread(self.import_wallet, wallet_name, private_key)
+    
+    async def aload_wallet(self, wallet_name: str = "default") -> Dict[str, Any]:
+        """Async load_wallet; runs the KDF in a worker thread"""
+        return await asyncio.to_thread(self.load_wallet, wallet_name)
+    
     def get_current_wallet(self) -> Optional[str]:
         """Get address of currently loaded wallet"""
-        return self.current_wallet.address if self.current_wallet else None
+        return self.current_wallet_address
     
     def get_balance(self, address: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -258,9 +477,9 @@ class WalletManager:
             dict: Balance information
         """
         if not address:
-            if not self.current_wallet:
+            if not self.current_wallet_address:
                 raise ValueError("No wallet loaded and no address provided")
-            address = self.current_wallet.address
+            address = self.current_wallet_address
         
         # Get balance from Web3
         wei_balance = self.web3_manager.get_balance(address)
@@ -291,9 +510,9 @@ class WalletManager:
             dict: Transaction history
         """
         if not address:
-            if not self.current_wallet:
+            if not self.current_wallet_address:
                 raise ValueError("No wallet loaded and no address provided")
-            address = self.current_wallet.address
+            address = self.current_wallet_address
         
         # Get transaction count
         tx_count = self.web3_manager.get_transaction_count(address)
@@ -308,8 +527,11 @@ class WalletManager:
     
     def list_wallets(self) -> list:
         """List all available wallets"""
-        wallet_files = self.wallet_dir.glob("*.json")
-        return [f.stem for f in wallet_files]
+        with os.scandir(self.wallet_dir) as entries:
+            return [
+                entry.name[:-5] for entry in entries
+                if entry.name.endswith(".json") and entry.is_file(follow_symlinks=False)
+            ]
     
     def sign_transaction(self, transaction: Dict[str, Any]) -> str:
         """
@@ -322,7 +544,15 @@ class WalletManager:
             str: Signed transaction (hex encoded)
         """
         if not self.current_wallet:
-            raise ValueError("No wallet loaded. Please load or create a wallet first.")
+            if self._pending_pk is None:
+                raise ValueError("No wallet loaded. Please load or create a wallet first.")
+            account = Account.from_key(self._pending_pk)
+            self._pending_pk = None
+            # The stored address is outside the GCM ciphertext, so it is
+            # only trusted once it matches the decrypted key
+            if account.address != self.current_wallet_address:
+                raise ValueError("Address mismatch - wallet may be corrupted")
+            self.current_wallet = account
         
         try:
             # Sign the transaction
@@ -340,6 +570,10 @@ class WalletManager:
             logger.error(f"Failed to sign transaction: {e}")
             raise
     
+    async def asign_transaction(self, transaction: Dict[str, Any]) -> str:
+        """Async sign_transaction; signing runs in a worker thread"""
+        return await asyncio.to_thread(self.sign_transaction, transaction)
+    
     def send_transaction(self, signed_transaction: str) -> str:
         """
         Broadcast a signed transaction
@@ -352,7 +586,7 @@ class WalletManager:
         """
         try:
             # Send the signed transaction
-            tx_hash = self.web3_manager.w3.eth.send_raw_transaction(signed_transaction)
+            tx_hash = self.w3.eth.send_raw_transaction(signed_transaction)
             tx_hash_hex = tx_hash.hex()
             
             logger.info(f"Transaction sent: {tx_hash_hex}")
@@ -366,7 +600,7 @@ class WalletManager:
         self,
         tx_hash: str,
         timeout: int = 120
-    ) -> Dict[str, Any]:
+    ) -> Any:
         """
         Wait for transaction confirmation
         
@@ -375,12 +609,12 @@ class WalletManager:
             timeout: Timeout in seconds
             
         Returns:
-            dict: Transaction receipt
+            AttributeDict: Transaction receipt
         """
         try:
             logger.info(f"Waiting for transaction {tx_hash} to be confirmed...")
             
-            receipt = self.web3_manager.w3.eth.wait_for_transaction_receipt(
+            receipt = self.w3.eth.wait_for_transaction_receipt(
                 tx_hash,
                 timeout=timeout
             )
@@ -390,7 +624,7 @@ class WalletManager:
                 f"status: {'SUCCESS' if receipt['status'] == 1 else 'FAILED'}"
             )
             
-            return dict(receipt)
+            return receipt
             
         except Exception as e:
             logger.error(f"Failed to get transaction receipt: {e}")
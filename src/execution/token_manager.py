@@ -2,8 +2,12 @@
 Token Manager - ERC-20 token operations
 """
 import logging
-from typing import Dict, Any, Optional
-from web3 import Web3
+import time
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+from eth_abi import encode, decode
+from .web3_connection import checksum
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +73,49 @@ ERC20_ABI = [
     }
 ]
 
+# 4-byte function selectors
+NAME_SELECTOR = bytes.fromhex("06fdde03")        # name()
+SYMBOL_SELECTOR = bytes.fromhex("95d89b41")      # symbol()
+DECIMALS_SELECTOR = bytes.fromhex("313ce567")    # decimals()
+BALANCE_OF_SELECTOR = bytes.fromhex("70a08231")  # balanceOf(address)
+ALLOWANCE_SELECTOR = bytes.fromhex("dd62ed3e")   # allowance(address,address)
+
+# Gas price is reused for this many seconds between transaction builds
+GAS_PRICE_TTL = 5.0
+
+# Powers of ten for every uint8 decimals value (token unit scale lookup)
+_POW10 = tuple(10 ** i for i in range(256))
+
+# Shared pool for independent RPC round-trips (I/O bound, so threads overlap)
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="token-rpc")
+
+
+def _metadata_calls(checksum_addresses: List[str]) -> List[Tuple[str, bytes]]:
+    """Build name/symbol/decimals calls for each token"""
+    return [
+        (address, selector)
+        for address in checksum_addresses
+        for selector in (NAME_SELECTOR, SYMBOL_SELECTOR, DECIMALS_SELECTOR)
+    ]
+
+
+def _token_info(address: str, name: str, symbol: str, decimals: int) -> Dict[str, Any]:
+    """Build a token info dict"""
+    return {
+        'address': address,
+        'name': name,
+        'symbol': symbol,
+        'decimals': decimals
+    }
+
+
+def _decode_string(data: bytes) -> str:
+    """Decode a string return value (some older tokens return bytes32)"""
+    try:
+        return decode(['string'], data)[0]
+    except Exception:
+        return data[:32].rstrip(b'\x00').decode('utf-8', errors='replace')
+
 
 class TokenManager:
     """
@@ -84,9 +131,42 @@ class TokenManager:
             web3_manager: Web3Manager instance
         """
         self.web3_manager = web3_manager
-        self.w3 = web3_manager.w3
+        
+        # Contract instances and metadata are immutable per token address
+        self._contract_cache: Dict[str, Any] = {}
+        self._info_cache: Dict[str, Dict[str, Any]] = {}
+        
+        # ERC-20 contract factory (ABI parsed once), built on first use
+        self._erc20_factory = None
+        
+        # Chain ID never changes for a connection; gas price is cached briefly
+        self._chain_id: Optional[int] = None
+        self._gas_price_cache: Optional[Tuple[int, float]] = None
         logger.info("Token manager initialized")
     
+    @property
+    def w3(self):
+        """Web3 instance for one operation, round-robin from the manager's pool"""
+        acquire = getattr(self.web3_manager, "acquire", None)
+        return acquire() if acquire else self.web3_manager.w3
+    
+    @property
+    def chain_id(self) -> int:
+        """Chain ID of the connected network (fetched once)"""
+        if self._chain_id is None:
+            self._chain_id = self.w3.eth.chain_id
+        return self._chain_id
+    
+    def _get_gas_price(self) -> int:
+        """Get current gas price, reusing the last value for GAS_PRICE_TTL seconds"""
+        now = time.monotonic()
+        if self._gas_price_cache and now - self._gas_price_cache[1] < GAS_PRICE_TTL:
+            return self._gas_price_cache[0]
+        
+        gas_price = self.w3.eth.gas_price
+        self._gas_price_cache = (gas_price, now)
+        return gas_price
+    
     def get_token_contract(self, token_address: str):
         """
         Get token contract instance
@@ -97,8 +177,125 @@ class TokenManager:
         Returns:
             Contract instance
         """
-        checksum_address = self.w3.to_checksum_address(token_address)
-        return self.w3.eth.contract(address=checksum_address, abi=ERC20_ABI)
+        checksum_address = checksum(token_address)
+        contract = self._contract_cache.get(checksum_address)
+        if contract is None:
+            if self._erc20_factory is None:
+                self._erc20_factory = self.w3.eth.contract(abi=ERC20_ABI)
+            contract = self._erc20_factory(address=checksum_address)
+            self._contract_cache[checksum_address] = contract
+        return contract
+    
+    def _multicall(self, calls: List[Tuple[str, bytes]]) -> List[Optional[bytes]]:
+        """
+        Execute read-only calls in a single eth_call via Multicall3
+        
+        Args:
+            calls: List of (target address, calldata) pairs
+            
+        Returns:
+            list: Return data per call, None for calls that reverted
+        """
+        return self.web3_manager.multicall(calls)
+    
+    def _call(self, checksum_address: str, data: bytes) -> bytes:
+        """
+        Issue a raw eth_call with pre-encoded calldata
+        
+        Skips the contract object's per-call ABI lookup and selector
+        encoding for the fixed ERC-20 read functions.
+        """
+        return self.w3.eth.call({'to': checksum_address, 'data': data})
+    
+    def _fetch_token_info(self, checksum_address: str) -> Dict[str, Any]:
+        """
+        Read token metadata with one call per field (no Multicall3)
+        
+        The three calls are independent, so they are issued concurrently.
+        """
+        name, symbol, decimals = [
+            _EXECUTOR.submit(self._call, checksum_address, selector)
+            for selector in (NAME_SELECTOR, SYMBOL_SELECTOR, DECIMALS_SELECTOR)
+        ]
+        return _token_info(
+            checksum_address,
+            _decode_string(name.result()),
+            _decode_string(symbol.result()),
+            decode(['uint8'], decimals.result())[0]
+        )
+    
+    def _fetch_tx_params(self, from_checksum: str, gas_price: Optional[int]) -> Dict[str, Any]:
+        """
+        Fetch gas price, nonce and chain ID for a transaction
+        
+        The lookups are independent RPCs and are issued concurrently;
+        chain ID and gas price are usually served from cache.
+        """
+        nonce = _EXECUTOR.submit(self.w3.eth.get_transaction_count, from_checksum)
+        chain_id = _EXECUTOR.submit(lambda: self.chain_id)
+        current_gas_price = None if gas_price else _EXECUTOR.submit(self._get_gas_price)
+        
+        return {
+            'gasPrice': gas_price or current_gas_price.result(),
+            'nonce': nonce.result(),
+            'chainId': chain_id.result()
+        }
+    
+    def _cache_token_info(self, checksum_addresses: List[str], results: List[Optional[bytes]]):
+        """Decode name/symbol/decimals multicall results into the info cache"""
+        for i, checksum_address in enumerate(checksum_addresses):
+            name, symbol, decimals = results[3 * i:3 * i + 3]
+            if name is None or symbol is None or decimals is None:
+                raise ValueError(f"Token metadata call reverted for {checksum_address}")
+            info = _token_info(
+                checksum_address,
+                _decode_string(name),
+                _decode_string(symbol),
+                decode(['uint8'], decimals)[0]
+            )
+            logger.info(
+                f"Token info: {info['symbol']} ({info['name']}), "
+                f"decimals: {info['decimals']}"
+            )
+            self._info_cache[checksum_address] = info
+    
+    def get_tokens_info(self, token_addresses: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get metadata for several tokens
+        
+        Uncached tokens are resolved with a single Multicall3 request,
+        falling back to per-token calls on chains without Multicall3.
+        Metadata never changes for a deployed token, so it is served from
+        memory afterwards.
+        
+        Args:
+            token_addresses: Token contract addresses
+            
+        Returns:
+            list: Token name, symbol, decimals per address (same order)
+        """
+        try:
+            checksums = [checksum(a) for a in token_addresses]
+            missing = [c for c in dict.fromkeys(checksums) if c not in self._info_cache]
+            
+            if missing:
+                try:
+                    results = self._multicall(_metadata_calls(missing))
+                    self._cache_token_info(missing, results)
+                except Exception as e:
+                    logger.warning(f"Multicall3 metadata read failed, using direct calls: {e}")
+                    for checksum_address in missing:
+                        if checksum_address not in self._info_cache:
+                            self._info_cache[checksum_address] = self._fetch_token_info(checksum_address)
+            
+            return [
+                {**self._info_cache[c], 'address': a}
+                for a, c in zip(token_addresses, checksums)
+            ]
+            
+        except Exception as e:
+            logger.error(f"Failed to get token info: {e}")
+            raise
     
     def get_token_info(self, token_address: str) -> Dict[str, Any]:
         """
@@ -110,24 +307,75 @@ class TokenManager:
         Returns:
             dict: Token name, symbol, decimals
         """
+        return self.get_tokens_info([token_address])[0]
+    
+    def get_token_balances(
+        self,
+        wallet_address: str,
+        token_addresses: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Get balances of several tokens for a wallet
+        
+        Metadata for uncached tokens and every balanceOf are read in one
+        Multicall3 request, so the cost is a single RPC regardless of the
+        number of tokens.
+        
+        Args:
+            wallet_address: Wallet address
+            token_addresses: Token contract addresses
+            
+        Returns:
+            list: Balance information per token (same order)
+        """
         try:
-            contract = self.get_token_contract(token_address)
+            wallet_checksum = checksum(wallet_address)
+            checksums = [checksum(a) for a in token_addresses]
+            missing = [c for c in dict.fromkeys(checksums) if c not in self._info_cache]
+            balance_data = BALANCE_OF_SELECTOR + encode(['address'], [wallet_checksum])
             
-            name = contract.functions.name().call()
-            symbol = contract.functions.symbol().call()
-            decimals = contract.functions.decimals().call()
+            try:
+                results = self._multicall(
+                    _metadata_calls(missing) + [(c, balance_data) for c in checksums]
+                )
+                self._cache_token_info(missing, results[:3 * len(missing)])
+                balance_results = results[3 * len(missing):]
+                if any(r is None for r in balance_results):
+                    raise ValueError("balanceOf call reverted")
+                balances = [decode(['uint256'], r)[0] for r in balance_results]
+            except Exception as e:
+                logger.warning(f"Multicall3 balance read failed, using direct calls: {e}")
+                balances = [
+                    decode(['uint256'], self._call(c, balance_data))[0]
+                    for c in checksums
+                ]
             
-            logger.info(f"Token info: {symbol} ({name}), decimals: {decimals}")
+            infos = self.get_tokens_info(token_addresses)
             
-            return {
-                'address': token_address,
-                'name': name,
-                'symbol': symbol,
-                'decimals': decimals
-            }
+            results = []
+            for token_address, info, balance_raw in zip(token_addresses, infos, balances):
+                # Convert to human-readable format
+                balance_formatted = balance_raw / _POW10[info['decimals']]
+                
+                logger.info(
+                    f"Token balance for {wallet_address[:10]}...: "
+                    f"{balance_formatted} {info['symbol']}"
+                )
+                
+                results.append({
+                    'wallet_address': wallet_address,
+                    'token_address': token_address,
+                    'token_name': info['name'],
+                    'token_symbol': info['symbol'],
+                    'decimals': info['decimals'],
+                    'balance': balance_formatted,
+                    'balance_raw': str(balance_raw)
+                })
+            
+            return results
             
         except Exception as e:
-            logger.error(f"Failed to get token info: {e}")
+            logger.error(f"Failed to get token balance: {e}")
             raise
     
     def get_token_balance(
@@ -145,37 +393,7 @@ class TokenManager:
         Returns:
             dict: Balance information
         """
-        try:
-            contract = self.get_token_contract(token_address)
-            wallet_checksum = self.w3.to_checksum_address(wallet_address)
-            
-            # Get token info
-            info = self.get_token_info(token_address)
-            
-            # Get balance
-            balance_raw = contract.functions.balanceOf(wallet_checksum).call()
-            
-            # Convert to human-readable format
-            balance_formatted = balance_raw / (10 ** info['decimals'])
-            
-            logger.info(
-                f"Token balance for {wallet_address[:10]}...: "
-                f"{balance_formatted} {info['symbol']}"
-            )
-            
-            return {
-                'wallet_address': wallet_address,
-                'token_address': token_address,
-                'token_name': info['name'],
-                'token_symbol': info['symbol'],
-                'decimals': info['decimals'],
-                'balance': balance_formatted,
-                'balance_raw': str(balance_raw)
-            }
-            
-        except Exception as e:
-            logger.error(f"Failed to get token balance: {e}")
-            raise
+        return self.get_token_balances(wallet_address, [token_address])[0]
     
     def build_transfer_transaction(
         self,
@@ -184,7 +402,8 @@ class TokenManager:
         token_address: str,
         amount: float,
         gas_limit: Optional[int] = None,
-        gas_price: Optional[int] = None
+        gas_price: Optional[int] = None,
+        token_info: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Build token transfer transaction
@@ -196,30 +415,30 @@ class TokenManager:
             amount: Amount in token units (e.g., 10.5 USDC)
             gas_limit: Gas limit (estimated if not provided)
             gas_price: Gas price (current if not provided)
+            token_info: Token info already fetched by the caller (e.g. from
+                get_token_balance); skips the metadata lookup
             
         Returns:
             dict: Transaction dictionary and token info
         """
         try:
             contract = self.get_token_contract(token_address)
-            info = self.get_token_info(token_address)
+            info = token_info or self.get_token_info(token_address)
+            scale = _POW10[info['decimals']]
             
-            # Convert amount to raw units
-            amount_raw = int(amount * (10 ** info['decimals']))
+            # Convert amount to raw units (Decimal avoids binary float rounding)
+            amount_raw = int(Decimal(str(amount)) * scale)
             
             # Build transfer data
-            to_checksum = self.w3.to_checksum_address(to_address)
+            from_checksum = checksum(from_address)
+            to_checksum = checksum(to_address)
             transfer_data = contract.functions.transfer(
                 to_checksum,
                 amount_raw
             ).build_transaction({
-                'from': self.w3.to_checksum_address(from_address),
+                'from': from_checksum,
                 'gas': gas_limit or 100000,  # Default for token transfer
-                'gasPrice': gas_price or self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(
-                    self.w3.to_checksum_address(from_address)
-                ),
-                'chainId': self.w3.eth.chain_id
+                **self._fetch_tx_params(from_checksum, gas_price)
             })
             
             logger.info(
@@ -245,7 +464,8 @@ class TokenManager:
         token_address: str,
         amount: float,
         gas_limit: Optional[int] = None,
-        gas_price: Optional[int] = None
+        gas_price: Optional[int] = None,
+        token_info: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Build token approval transaction
@@ -257,30 +477,30 @@ class TokenManager:
             amount: Amount to approve in token units
             gas_limit: Gas limit
             gas_price: Gas price
+            token_info: Token info already fetched by the caller; skips the
+                metadata lookup
             
         Returns:
             dict: Transaction dictionary and token info
         """
         try:
             contract = self.get_token_contract(token_address)
-            info = self.get_token_info(token_address)
+            info = token_info or self.get_token_info(token_address)
+            scale = _POW10[info['decimals']]
             
-            # Convert amount to raw units
-            amount_raw = int(amount * (10 ** info['decimals']))
+            # Convert amount to raw units (Decimal avoids binary float rounding)
+            amount_raw = int(Decimal(str(amount)) * scale)
             
             # Build approve data
-            spender_checksum = self.w3.to_checksum_address(spender_address)
+            from_checksum = checksum(from_address)
+            spender_checksum = checksum(spender_address)
             approve_data = contract.functions.approve(
                 spender_checksum,
                 amount_raw
             ).build_transaction({
-                'from': self.w3.to_checksum_address(from_address),
+                'from': from_checksum,
                 'gas': gas_limit or 60000,  # Default for approval
-                'gasPrice': gas_price or self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(
-                    self.w3.to_checksum_address(from_address)
-                ),
-                'chainId': self.w3.eth.chain_id
+                **self._fetch_tx_params(from_checksum, gas_price)
             })
             
             logger.info(
@@ -317,18 +537,19 @@ class TokenManager:
             dict: Allowance information
         """
         try:
-            contract = self.get_token_contract(token_address)
             info = self.get_token_info(token_address)
             
-            owner_checksum = self.w3.to_checksum_address(owner_address)
-            spender_checksum = self.w3.to_checksum_address(spender_address)
+            token_checksum = checksum(token_address)
+            owner_checksum = checksum(owner_address)
+            spender_checksum = checksum(spender_address)
             
-            allowance_raw = contract.functions.allowance(
-                owner_checksum,
-                spender_checksum
-            ).call()
+            data = ALLOWANCE_SELECTOR + encode(
+                ['address', 'address'],
+                [owner_checksum, spender_checksum]
+            )
+            (allowance_raw,) = decode(['uint256'], self._call(token_checksum, data))
             
-            allowance_formatted = allowance_raw / (10 ** info['decimals'])
+            allowance_formatted = allowance_raw / _POW10[info['decimals']]
             
             return {
                 'owner': owner_address,
@@ -1,12 +1,28 @@
 """
 Transaction Builder - Build, estimate, and simulate transactions
 """
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+import threading
+import time
+from typing import Dict, Any, Optional, Set, Tuple
 from web3 import Web3
+from .web3_connection import checksum
 
 logger = logging.getLogger(__name__)
 
+# Gas price is reused for this many seconds between transaction builds
+GAS_PRICE_TTL = 5.0
+
+# Gas limit for a plain value transfer to an EOA (21000 + 10% buffer)
+SIMPLE_TRANSFER_GAS = (21000 * 11) // 10
+
+EMPTY_DATA = ("0x", "", b"")
+
+# An address seen without code may get some later (deployment to a
+# precomputed address, EIP-7702 delegation), so that answer is rechecked
+EOA_CACHE_TTL = 60.0
+
 
 class TransactionBuilder:
     """
@@ -22,31 +38,166 @@ class TransactionBuilder:
             web3_manager: Web3Manager instance
         """
         self.web3_manager = web3_manager
-        self.w3 = web3_manager.w3
+        
+        # Chain ID never changes for a connection; gas price is cached briefly
+        self._chain_id: Optional[int] = None
+        self._gas_price_cache: Optional[Tuple[int, float]] = None
+        
+        # (gas estimate, gas price, time) from simulate_transaction, keyed on
+        # (from, to, value, data); consumed by the following build_transaction
+        self._simulation_cache: Dict[Tuple[str, str, int, str], Tuple[int, int, float]] = {}
+        
+        # Addresses known to have code (effectively permanent), and when each
+        # address without code was last checked (expires after EOA_CACHE_TTL)
+        self._contract_addresses: Set[str] = set()
+        self._eoa_checked_at: Dict[str, float] = {}
+        
+        # Next nonce per sender, fetched once and incremented locally.
+        # Transactions sent from the same address outside this builder make
+        # it stale; call reset_nonce to resync.
+        self._nonces: Dict[str, int] = {}
+        self._nonce_lock = threading.Lock()
         logger.info("Transaction builder initialized")
     
+    @property
+    def w3(self):
+        """Web3 instance for one operation, round-robin from the manager's pool"""
+        acquire = getattr(self.web3_manager, "acquire", None)
+        return acquire() if acquire else self.web3_manager.w3
+    
+    def _get_chain_id(self) -> int:
+        """Chain ID of the connected network (fetched once)"""
+        if self._chain_id is None:
+            self._chain_id = self.w3.eth.chain_id
+        return self._chain_id
+    
+    def _cached_gas_price(self) -> Optional[int]:
+        """Return the cached gas price if it is younger than GAS_PRICE_TTL"""
+        if self._gas_price_cache and time.monotonic() - self._gas_price_cache[1] < GAS_PRICE_TTL:
+            return self._gas_price_cache[0]
+        # Websocket connections keep a block-fresh price without polling
+        pushed_gas_price = getattr(self.web3_manager, "pushed_gas_price", None)
+        return pushed_gas_price() if pushed_gas_price else None
+    
+    def _store_gas_price(self, gas_price: int):
+        """Remember a freshly fetched gas price"""
+        self._gas_price_cache = (gas_price, time.monotonic())
+    
+    def _take_simulation(
+        self,
+        from_checksum: str,
+        to_checksum: str,
+        value: int,
+        data: str
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Pop a fresh simulate_transaction result for the same transaction
+        
+        Returns:
+            tuple: (gas limit with 10% buffer, gas price), or None
+        """
+        simulated = self._simulation_cache.pop((from_checksum, to_checksum, value, data), None)
+        if simulated and time.monotonic() - simulated[2] < GAS_PRICE_TTL:
+            return (simulated[0] * 11) // 10, simulated[1]
+        return None
+    
+    def _fee_suggestions(self) -> Optional[Tuple[int, int]]:
+        """EIP-1559 (maxFeePerGas, maxPriorityFeePerGas), or None to use legacy gasPrice"""
+        get_fee_suggestions = getattr(self.web3_manager, "get_fee_suggestions", None)
+        if get_fee_suggestions is None:
+            return None
+        try:
+            return get_fee_suggestions()
+        except Exception as e:
+            logger.warning(f"Fee history unavailable, using legacy gas price: {e}")
+            return None
+    
+    @staticmethod
+    def _fee_fields(gas_price: Optional[int], fees: Optional[Tuple[int, int]]) -> Dict[str, Any]:
+        """Transaction fee fields: EIP-1559 when fees are known, else legacy gasPrice"""
+        if fees:
+            return {'type': 2, 'maxFeePerGas': fees[0], 'maxPriorityFeePerGas': fees[1]}
+        return {'gasPrice': gas_price}
+    
+    def _cached_is_contract(self, checksum_address: str) -> Optional[bool]:
+        """Whether an address has code per the cache, or None if unknown or expired"""
+        if checksum_address in self._contract_addresses:
+            return True
+        checked_at = self._eoa_checked_at.get(checksum_address)
+        if checked_at is not None and time.monotonic() - checked_at < EOA_CACHE_TTL:
+            return False
+        return None
+    
+    def _is_contract(self, checksum_address: str) -> bool:
+        """
+        Check whether an address has deployed code
+        
+        Contracts are cached for good; addresses without code are rechecked
+        after EOA_CACHE_TTL seconds.
+        
+        Args:
+            checksum_address: Address to check
+            
+        Returns:
+            bool: True if the address is a contract
+        """
+        is_contract = self._cached_is_contract(checksum_address)
+        if is_contract is None:
+            is_contract = len(self.w3.eth.get_code(checksum_address)) > 0
+            if is_contract:
+                self._contract_addresses.add(checksum_address)
+                self._eoa_checked_at.pop(checksum_address, None)
+            else:
+                self._eoa_checked_at[checksum_address] = time.monotonic()
+        return is_contract
+    
+    def _known_simple_transfer(
+        self,
+        to_checksum: str,
+        data: str,
+        to_is_contract: Optional[bool]
+    ) -> bool:
+        """Whether a transfer is known to go to an EOA without calldata (no RPC)"""
+        if data not in EMPTY_DATA:
+            return False
+        if to_is_contract is None:
+            to_is_contract = self._cached_is_contract(to_checksum)
+        return to_is_contract is False
+    
     def estimate_gas(
         self,
         from_address: str,
         to_address: str,
         value: int = 0,
-        data: str = "0x"
+        data: str = "0x",
+        to_is_contract: Optional[bool] = None
     ) -> int:
         """
         Estimate gas for a transaction
         
+        Plain value transfers to an EOA always cost 21000 gas, so they skip
+        eth_estimateGas.
+        
         Args:
             from_address: Sender address
             to_address: Recipient address
             value: Amount in wei
             data: Transaction data (for contract calls)
+            to_is_contract: Whether the recipient is a contract (looked up
+                and cached via eth_getCode if not provided)
             
         Returns:
             int: Estimated gas limit
         """
         try:
-            from_checksum = self.w3.to_checksum_address(from_address)
-            to_checksum = self.w3.to_checksum_address(to_address)
+            from_checksum = checksum(from_address)
+            to_checksum = checksum(to_address)
+            
+            if data in EMPTY_DATA:
+                if to_is_contract is None:
+                    to_is_contract = self._is_contract(to_checksum)
+                if not to_is_contract:
+                    return SIMPLE_TRANSFER_GAS
             
             gas_estimate = self.w3.eth.estimate_gas({
                 'from': from_checksum,
@@ -56,9 +207,9 @@ class TransactionBuilder:
             })
             
             # Add 10% buffer for safety
-            gas_with_buffer = int(gas_estimate * 1.1)
+            gas_with_buffer = (gas_estimate * 11) // 10
             
-            logger.info(f"Gas estimated: {gas_estimate} (with buffer: {gas_with_buffer})")
+            logger.info("Gas estimated: %s (with buffer: %s)", gas_estimate, gas_with_buffer)
             return gas_with_buffer
             
         except Exception as e:
@@ -68,9 +219,42 @@ class TransactionBuilder:
                 return 21000
             raise
     
+    def _reserve_nonce(self, checksum_address: str, fetched: Optional[int] = None) -> Optional[int]:
+        """
+        Hand out the next local nonce for an address
+        
+        Args:
+            checksum_address: Sender address
+            fetched: Transaction count just read from the node, used to seed
+                the cache when the address is not tracked yet
+            
+        Returns:
+            int: Reserved nonce, or None if untracked and nothing was fetched
+        """
+        with self._nonce_lock:
+            nonce = self._nonces.get(checksum_address, fetched)
+            if nonce is not None:
+                self._nonces[checksum_address] = nonce + 1
+            return nonce
+    
+    def reset_nonce(self, address: str):
+        """
+        Forget the local nonce for an address so the next build resyncs
+        
+        Args:
+            address: Ethereum address
+        """
+        checksum_address = checksum(address)
+        with self._nonce_lock:
+            self._nonces.pop(checksum_address, None)
+        logger.debug("Nonce cache reset for %s", address)
+    
     def get_nonce(self, address: str) -> int:
         """
-        Get transaction nonce for an address
+        Reserve the next transaction nonce for an address
+        
+        The pending transaction count is fetched once per address; later
+        calls increment locally without an RPC.
         
         Args:
             address: Ethereum address
@@ -78,20 +262,26 @@ class TransactionBuilder:
         Returns:
             int: Nonce (transaction count)
         """
-        checksum_address = self.w3.to_checksum_address(address)
-        nonce = self.w3.eth.get_transaction_count(checksum_address)
-        logger.debug(f"Nonce for {address}: {nonce}")
+        checksum_address = checksum(address)
+        nonce = self._reserve_nonce(checksum_address)
+        if nonce is None:
+            fetched = self.w3.eth.get_transaction_count(checksum_address, 'pending')
+            nonce = self._reserve_nonce(checksum_address, fetched)
+        logger.debug("Nonce for %s: %s", address, nonce)
         return nonce
     
     def get_gas_price(self) -> int:
         """
-        Get current gas price
+        Get current gas price (cached for GAS_PRICE_TTL seconds)
         
         Returns:
             int: Gas price in wei
         """
-        gas_price = self.w3.eth.gas_price
-        logger.debug(f"Current gas price: {gas_price} wei")
+        gas_price = self._cached_gas_price()
+        if gas_price is None:
+            gas_price = self.w3.eth.gas_price
+            self._store_gas_price(gas_price)
+        logger.debug("Current gas price: %s wei", gas_price)
         return gas_price
     
     def build_transaction(
@@ -102,7 +292,8 @@ class TransactionBuilder:
         gas_limit: Optional[int] = None,
         gas_price: Optional[int] = None,
         data: str = "0x",
-        nonce: Optional[int] = None
+        nonce: Optional[int] = None,
+        to_is_contract: Optional[bool] = None
     ) -> Dict[str, Any]:
         """
         Build a transaction dictionary
@@ -115,23 +306,63 @@ class TransactionBuilder:
             gas_price: Gas price in wei (current price if not provided)
             data: Transaction data
             nonce: Transaction nonce (current if not provided)
+            to_is_contract: Pass False for a known EOA recipient to skip gas
+                estimation on plain transfers
             
         Returns:
             dict: Transaction dictionary ready for signing
         """
-        from_checksum = self.w3.to_checksum_address(from_address)
-        to_checksum = self.w3.to_checksum_address(to_address)
+        from_checksum = checksum(from_address)
+        to_checksum = checksum(to_address)
         
-        # Get nonce if not provided
+        if nonce is None:
+            nonce = self._reserve_nonce(from_checksum)
+        
+        if gas_limit is None and self._known_simple_transfer(to_checksum, data, to_is_contract):
+            gas_limit = SIMPLE_TRANSFER_GAS
+        
+        # EIP-1559 fees unless the caller fixed a legacy gas price
+        fees = self._fee_suggestions() if gas_price is None else None
+        need_gas_price = gas_price is None and fees is None
+        
+        # Reuse a fresh simulation of the same transaction
+        if gas_limit is None or need_gas_price:
+            simulated = self._take_simulation(from_checksum, to_checksum, value, data)
+            if simulated:
+                gas_limit = gas_limit or simulated[0]
+                if need_gas_price:
+                    gas_price = simulated[1]
+        
+        if need_gas_price and gas_price is None:
+            gas_price = self._cached_gas_price()
+        
+        # Fetch missing defaults in one batched round-trip
+        if nonce is None or gas_limit is None or (need_gas_price and gas_price is None):
+            try:
+                preflight = self.web3_manager.batch_preflight(
+                    from_address, to_address, value, data
+                )
+            except Exception as e:
+                logger.warning(f"Batched preflight failed, using per-call lookups: {e}")
+                preflight = {}
+            
+            if nonce is None and preflight.get('nonce') is not None:
+                nonce = self._reserve_nonce(from_checksum, preflight['nonce'])
+            if gas_limit is None and preflight.get('gas') is not None:
+                # Add 10% buffer for safety
+                gas_limit = (preflight['gas'] * 11) // 10
+            if need_gas_price and gas_price is None and preflight.get('gas_price') is not None:
+                gas_price = preflight['gas_price']
+                self._store_gas_price(gas_price)
+        
+        # Per-call fallback for anything the batch did not return
         if nonce is None:
             nonce = self.get_nonce(from_address)
         
-        # Estimate gas if not provided
         if gas_limit is None:
             gas_limit = self.estimate_gas(from_address, to_address, value, data)
         
-        # Get gas price if not provided
-        if gas_price is None:
+        if need_gas_price and gas_price is None:
             gas_price = self.get_gas_price()
         
         # Build transaction
@@ -140,13 +371,118 @@ class TransactionBuilder:
             'to': to_checksum,
             'value': value,
             'gas': gas_limit,
-            'gasPrice': gas_price,
+            **self._fee_fields(gas_price, fees),
             'nonce': nonce,
-            'chainId': self.w3.eth.chain_id,
+            'chainId': self._get_chain_id(),
+            'data': data
+        }
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Transaction built: {from_address[:10]}... → {to_address[:10]}...")
+        return transaction
+    
+    async def abuild_transaction(
+        self,
+        from_address: str,
+        to_address: str,
+        value: int,
+        gas_limit: Optional[int] = None,
+        gas_price: Optional[int] = None,
+        data: str = "0x",
+        nonce: Optional[int] = None,
+        to_is_contract: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Build a transaction dictionary without blocking the event loop
+        
+        Missing nonce, gas limit and gas price are fetched concurrently.
+        
+        Args:
+            from_address: Sender address
+            to_address: Recipient address
+            value: Amount in wei
+            gas_limit: Gas limit (estimated if not provided)
+            gas_price: Gas price in wei (current price if not provided)
+            data: Transaction data
+            nonce: Transaction nonce (current if not provided)
+            to_is_contract: Pass False for a known EOA recipient to skip gas
+                estimation on plain transfers
+            
+        Returns:
+            dict: Transaction dictionary ready for signing
+        """
+        from_checksum = checksum(from_address)
+        to_checksum = checksum(to_address)
+        
+        if gas_limit is None and self._known_simple_transfer(to_checksum, data, to_is_contract):
+            gas_limit = SIMPLE_TRANSFER_GAS
+        
+        # EIP-1559 fees unless the caller fixed a legacy gas price
+        fees = await asyncio.to_thread(self._fee_suggestions) if gas_price is None else None
+        
+        # Reuse a fresh simulation of the same transaction
+        if gas_limit is None or gas_price is None:
+            simulated = self._take_simulation(from_checksum, to_checksum, value, data)
+            if simulated:
+                gas_limit = gas_limit or simulated[0]
+                gas_price = gas_price or simulated[1]
+        
+        async def _nonce() -> int:
+            if nonce is not None:
+                return nonce
+            reserved = self._reserve_nonce(from_checksum)
+            if reserved is not None:
+                return reserved
+            fetched = await self.web3_manager.aget_transaction_count(from_checksum, 'pending')
+            return self._reserve_nonce(from_checksum, fetched)
+        
+        async def _gas_limit() -> int:
+            if gas_limit is not None:
+                return gas_limit
+            try:
+                gas_estimate = await self.web3_manager.aestimate_gas({
+                    'from': from_checksum,
+                    'to': to_checksum,
+                    'value': value,
+                    'data': data
+                })
+                # Add 10% buffer for safety
+                return (gas_estimate * 11) // 10
+            except Exception as e:
+                logger.error(f"Gas estimation failed: {e}")
+                # Return safe default for simple transfers
+                if data == "0x":
+                    return 21000
+                raise
+        
+        async def _gas_price() -> Optional[int]:
+            if gas_price is not None or fees:
+                return gas_price
+            cached = self._cached_gas_price()
+            if cached is not None:
+                return cached
+            fresh = await self.web3_manager.aget_gas_price()
+            self._store_gas_price(fresh)
+            return fresh
+        
+        tx_nonce, tx_gas, tx_gas_price = await asyncio.gather(
+            _nonce(), _gas_limit(), _gas_price()
+        )
+        
+        # Build transaction
+        transaction = {
+            'from': from_checksum,
+            'to': to_checksum,
+            'value': value,
+            'gas': tx_gas,
+            **self._fee_fields(tx_gas_price, fees),
+            'nonce': tx_nonce,
+            'chainId': self._get_chain_id(),
             'data': data
         }
         
-        logger.info(f"Transaction built: {from_address[:10]}... → {to_address[:10]}...")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Transaction built: {from_address[:10]}... → {to_address[:10]}...")
         return transaction
     
     def simulate_transaction(
@@ -159,6 +495,10 @@ class TransactionBuilder:
         """
         Simulate a transaction (dry run)
         
+        Gas estimate, gas price and balance are fetched in one batched
+        request; the estimate and price are reused by a following
+        build_transaction for the same transaction.
+        
         Args:
             from_address: Sender address
             to_address: Recipient address
@@ -169,26 +509,40 @@ class TransactionBuilder:
             dict: Simulation result with success status and gas estimate
         """
         try:
-            from_checksum = self.w3.to_checksum_address(from_address)
-            to_checksum = self.w3.to_checksum_address(to_address)
+            from_checksum = checksum(from_address)
+            to_checksum = checksum(to_address)
             
-            # Try to estimate gas (will fail if transaction would revert)
-            gas_estimate = self.w3.eth.estimate_gas({
-                'from': from_checksum,
-                'to': to_checksum,
-                'value': value,
-                'data': data
-            })
+            # Estimate gas (fails if transaction would revert), price and balance in one batch
+            estimate_result, price_result, balance_result = self.web3_manager.batch_call([
+                ("eth_estimateGas", [{
+                    'from': from_checksum,
+                    'to': to_checksum,
+                    'value': hex(value),
+                    'data': data
+                }]),
+                ("eth_gasPrice", []),
+                ("eth_getBalance", [from_checksum, "latest"]),
+            ])
+            for result in (estimate_result, price_result, balance_result):
+                if isinstance(result, Exception):
+                    raise result
             
-            # Get current gas price
-            gas_price = self.get_gas_price()
+            gas_estimate = int(estimate_result, 16)
+            gas_price = int(price_result, 16)
+            balance = int(balance_result, 16)
+            self._store_gas_price(gas_price)
+            
+            if len(self._simulation_cache) > 256:
+                self._simulation_cache.clear()
+            self._simulation_cache[(from_checksum, to_checksum, value, data)] = (
+                gas_estimate, gas_price, time.monotonic()
+            )
             
             # Calculate costs
             gas_cost_wei = gas_estimate * gas_price
             total_cost_wei = value + gas_cost_wei
             
             # Check balance
-            balance = self.web3_manager.get_balance(from_address)
             has_sufficient_balance = balance >= total_cost_wei
             
             return {
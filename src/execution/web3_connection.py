@@ -3,15 +3,200 @@ Web3 Connection Manager
 Handles blockchain network connections and RPC management
 """
 import os
+import asyncio
+import itertools
 import logging
-from typing import Optional, Dict, Any
-from web3 import Web3
+import random
+import threading
+import time
+from collections import deque
+from decimal import Decimal
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple, Callable, Deque
+import requests
+from eth_abi import encode, decode
+from web3 import Web3, AsyncWeb3
+from web3.providers import HTTPProvider
 from dotenv import load_dotenv
 
-load_dotenv()
+try:
+    import orjson  # Optional: faster JSON-RPC encoding/decoding
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# HTTP keep-alive pool shared by all RPC calls of a Web3Manager
+RPC_POOL_CONNECTIONS = 10
+RPC_POOL_MAXSIZE = 100
+RPC_KEEPALIVE_TIMEOUT = 60
+RPC_TIMEOUT = 15
+
+WEI_PER_ETHER = 10 ** 18
+
+# Retry/backoff and circuit breaker for transient RPC failures (429/5xx, timeouts).
+# This is the only retry layer: web3's own retry middleware and urllib3's
+# adapter retries are disabled so attempts do not multiply.
+RPC_MAX_ATTEMPTS = 5
+RPC_BACKOFF_BASE = 0.05
+CIRCUIT_FAILURE_THRESHOLD = 20
+CIRCUIT_FAILURE_WINDOW = 10.0
+CIRCUIT_OPEN_DURATION = 5.0
+
+# Multicall3 is deployed at the same address on all major EVM chains
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+AGGREGATE3_SELECTOR = bytes.fromhex("82ad56cb")  # aggregate3((address,bool,bytes)[])
+
+# .env is parsed once, on the first Web3Manager (not at import)
+_ENV_LOADED = False
+
+# Web3 instances (each with its own connection pool) shared per HTTP RPC URL
+RPC_POOL_INSTANCES = 4
+
+# A gas price pushed by the newHeads subscription is trusted for this long
+PUSHED_GAS_PRICE_TTL = 30.0
+# Resubscribe backoff after the newHeads subscription drops: doubles up to the cap
+GAS_RESUBSCRIBE_DELAY = 1.0
+GAS_RESUBSCRIBE_MAX_DELAY = 60.0
+
+# EIP-1559 fee suggestions are refreshed once per block (~12s, or on newHeads)
+FEE_HISTORY_TTL = 12.0
+FEE_HISTORY_BLOCKS = 10
+FEE_HISTORY_PERCENTILES = [10, 50, 90]
+
+
+@lru_cache(maxsize=4096)
+def _checksum_lower(address: str) -> str:
+    """EIP-55 checksum a lowercased address, memoized"""
+    return Web3.to_checksum_address(address)
+
+
+def checksum(address: str) -> str:
+    """
+    EIP-55 checksum an address
+    
+    The address is lowercased first so every spelling of the same address
+    shares one cache entry (and one keccak computation).
+    """
+    return _checksum_lower(address.lower())
+
+
+def _orjson_default(value: Any) -> Any:
+    """Serialize the web3 types orjson does not know (HexBytes, AttributeDict)"""
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + value.hex()
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class ResilientHTTPProvider(HTTPProvider):
+    """
+    HTTPProvider that retries transient failures with exponential backoff and
+    jitter, and fails fast for a while once the endpoint keeps failing.
+    Only connection errors, timeouts, 429 and 5xx responses are retried.
+    Broadcasts are never retried, and neither are calls made on the event
+    loop thread (backing off there would block every other request); the API
+    routes run RPC-bound calls in worker threads so they do get retries.
+    """
+    
+    # A broadcast that failed in flight may still have reached the node
+    NON_RETRYABLE_METHODS = frozenset({"eth_sendRawTransaction", "eth_sendTransaction"})
+    
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("exception_retry_configuration", None)
+        super().__init__(*args, **kwargs)
+        self._failures: Deque[float] = deque()
+        self._circuit_open_until = 0.0
+        self._breaker_lock = threading.Lock()
+    
+    def _record_failure(self):
+        """Count a failure and open the circuit if the window threshold is hit"""
+        now = time.monotonic()
+        with self._breaker_lock:
+            self._failures.append(now)
+            while self._failures and now - self._failures[0] > CIRCUIT_FAILURE_WINDOW:
+                self._failures.popleft()
+            if len(self._failures) > CIRCUIT_FAILURE_THRESHOLD:
+                self._circuit_open_until = now + CIRCUIT_OPEN_DURATION
+                self._failures.clear()
+                logger.warning(f"RPC circuit open for {CIRCUIT_OPEN_DURATION}s after repeated failures")
+    
+    def _with_retries(self, method: str, send: Callable[[], Any]) -> Any:
+        """Run one provider request with retry and circuit breaker handling"""
+        for attempt in range(RPC_MAX_ATTEMPTS):
+            if time.monotonic() < self._circuit_open_until:
+                raise ConnectionError("RPC circuit open, endpoint is failing")
+            try:
+                return send()
+            except (
+                requests.exceptions.HTTPError,
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout
+            ) as e:
+                # Client errors (bad request, auth, not found) will not heal on
+                # retry and say nothing about the endpoint's health
+                if isinstance(e, requests.exceptions.HTTPError) and not self._is_transient_status(e):
+                    raise
+                self._record_failure()
+                if (
+                    method in self.NON_RETRYABLE_METHODS
+                    or attempt == RPC_MAX_ATTEMPTS - 1
+                    or self._on_event_loop()
+                ):
+                    raise
+                delay = RPC_BACKOFF_BASE * 2 ** attempt + random.random() * RPC_BACKOFF_BASE
+                logger.debug("RPC %s failed (%s), retrying in %.2fs", method, e, delay)
+                time.sleep(delay)
+    
+    @staticmethod
+    def _is_transient_status(error: requests.exceptions.HTTPError) -> bool:
+        """True for rate limiting (429) and server errors (5xx)"""
+        response = error.response
+        if response is None:
+            return True
+        return response.status_code == 429 or response.status_code >= 500
+    
+    @staticmethod
+    def _on_event_loop() -> bool:
+        """True when called on a thread running an asyncio loop, where sleeping would stall it"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return True
+    
+    def encode_rpc_request(self, method, params) -> bytes:
+        if orjson is None:
+            return super().encode_rpc_request(method, params)
+        try:
+            return orjson.dumps({
+                "jsonrpc": "2.0",
+                "method": method,
+                "params": params or [],
+                "id": next(self.request_counter),
+            }, default=_orjson_default)
+        except TypeError:
+            # orjson is limited to 64-bit integers; the stdlib path is not
+            return super().encode_rpc_request(method, params)
+    
+    def decode_rpc_response(self, raw_response: bytes):
+        if orjson is None:
+            return super().decode_rpc_response(raw_response)
+        try:
+            return orjson.loads(raw_response)
+        except orjson.JSONDecodeError:
+            return super().decode_rpc_response(raw_response)
+    
+    def make_request(self, method, params):
+        return self._with_retries(method, lambda: super(ResilientHTTPProvider, self).make_request(method, params))
+    
+    def make_batch_request(self, batch_requests):
+        return self._with_retries(
+            "batch", lambda: super(ResilientHTTPProvider, self).make_batch_request(batch_requests)
+        )
+
 
 class Web3Manager:
     """
@@ -46,6 +231,9 @@ class Web3Manager:
         }
     }
     
+    # HTTP Web3 instances per RPC URL, shared by every Web3Manager in the process
+    _POOL: Dict[str, List[Web3]] = {}
+    
     def __init__(self, network: Optional[str] = None, rpc_url: Optional[str] = None):
         """
         Initialize Web3 manager
@@ -54,6 +242,13 @@ class Web3Manager:
             network: Network name (e.g., 'sepolia', 'polygon_mumbai')
             rpc_url: Custom RPC URL (overrides network default)
         """
+        global _ENV_LOADED
+        if not _ENV_LOADED:
+            # Workers started with the environment already set skip the file read
+            if os.getenv("WEB3_RPC_URL") is None:
+                load_dotenv()
+            _ENV_LOADED = True
+        
         self.network = network or os.getenv("WEB3_NETWORK", "sepolia")
         self.rpc_url = rpc_url or os.getenv("WEB3_RPC_URL")
         
@@ -64,6 +259,20 @@ class Web3Manager:
             )
         
         self.w3: Optional[Web3] = None
+        self._instances: List[Web3] = []
+        self._round_robin = itertools.count()
+        # Non-blocking client for coroutine callers
+        self.async_w3: Optional[AsyncWeb3] = None
+        
+        # Gas price refreshed on every new block (websocket endpoints only)
+        self._pushed_gas_price: Optional[Tuple[int, float]] = None
+        self._gas_task: Optional[asyncio.Task] = None
+        
+        # Chain ID never changes for a connection
+        self._chain_id: Optional[int] = None
+        
+        # ((maxFeePerGas, maxPriorityFeePerGas) or None if pre-London, time)
+        self._fee_cache: Optional[Tuple[Optional[Tuple[int, int]], float]] = None
         self.network_info = self.SUPPORTED_NETWORKS.get(self.network, {})
         
         logger.info(f"Initializing Web3Manager for network: {self.network}")
@@ -80,13 +289,33 @@ class Web3Manager:
             
             # Create Web3 instance
             if self.rpc_url.startswith("ws"):
-                from web3.providers import WebsocketProvider
-                provider = WebsocketProvider(self.rpc_url)
+                # One persistent socket multiplexes all calls (no per-call handshake)
+                from web3.providers import LegacyWebSocketProvider, WebSocketProvider
+                provider = LegacyWebSocketProvider(self.rpc_url)
+                
+                self.async_w3 = AsyncWeb3(WebSocketProvider(self.rpc_url))
+                await self.async_w3.provider.connect()
+                self._instances = [Web3(provider)]
             else:
-                from web3.providers import HTTPProvider
-                provider = HTTPProvider(self.rpc_url)
+                instances = self._POOL.get(self.rpc_url)
+                if instances is None:
+                    instances = [
+                        Web3(ResilientHTTPProvider(
+                            self.rpc_url,
+                            request_kwargs={"timeout": RPC_TIMEOUT},
+                            session=self._create_http_session()
+                        ))
+                        for _ in range(RPC_POOL_INSTANCES)
+                    ]
+                    self._POOL[self.rpc_url] = instances
+                self._instances = instances
+                
+                from web3.providers import AsyncHTTPProvider
+                async_provider = AsyncHTTPProvider(self.rpc_url)
+                await async_provider.cache_async_session(self._create_async_http_session())
+                self.async_w3 = AsyncWeb3(async_provider)
             
-            self.w3 = Web3(provider)
+            self.w3 = self._instances[0]
             
             # Note: PoA middleware not needed in web3.py v7+
             # Polygon networks work without explicit middleware injection
@@ -97,6 +326,7 @@ class Web3Manager:
             
             # Verify network
             chain_id = self.w3.eth.chain_id
+            self._chain_id = chain_id
             expected_chain_id = self.network_info.get("chain_id")
             
             if expected_chain_id and chain_id != expected_chain_id:
@@ -109,16 +339,162 @@ class Web3Manager:
                 f"(Chain ID: {chain_id})"
             )
             
+            if self.rpc_url.startswith("ws"):
+                self._gas_task = asyncio.create_task(self.subscribe_gas_updates())
+                self._gas_task.add_done_callback(self._on_gas_task_done)
+            
             return True
             
         except Exception as e:
             logger.error(f"Failed to connect to Web3: {e}")
             raise
     
+    @staticmethod
+    def _create_http_session():
+        """
+        Create a pooled HTTP session so RPC bursts reuse one TCP/TLS connection
+        
+        Returns:
+            requests.Session: Session with a keep-alive connection pool
+        """
+        from requests.adapters import HTTPAdapter
+        
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=RPC_POOL_CONNECTIONS,
+            pool_maxsize=RPC_POOL_MAXSIZE,
+            # Retries are handled once, in ResilientHTTPProvider
+            max_retries=0
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+    
+    @staticmethod
+    def _create_async_http_session():
+        """
+        Create a pooled aiohttp session for the AsyncWeb3 client
+        
+        Returns:
+            aiohttp.ClientSession: Session with a keep-alive connection pool
+        """
+        import aiohttp
+        
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=RPC_POOL_MAXSIZE,
+                keepalive_timeout=RPC_KEEPALIVE_TIMEOUT
+            ),
+            timeout=aiohttp.ClientTimeout(total=RPC_TIMEOUT)
+        )
+    
+    def acquire(self) -> Web3:
+        """
+        Hand out a pooled Web3 instance (round-robin) for one operation
+        
+        Returns:
+            Web3: Connected Web3 instance
+        """
+        if not self._instances:
+            return self.w3
+        return self._instances[next(self._round_robin) % len(self._instances)]
+    
+    async def subscribe_gas_updates(self):
+        """
+        Refresh the gas price on every new block via an eth_subscribe newHeads
+        
+        Runs until cancelled; only available on websocket endpoints. When the
+        socket drops or the subscription fails, it reconnects and resubscribes
+        with exponential backoff (get_gas_price polls the node meanwhile).
+        """
+        if self.async_w3 is None or not self.rpc_url.startswith("ws"):
+            return
+        
+        delay = GAS_RESUBSCRIBE_DELAY
+        while True:
+            try:
+                provider = self.async_w3.provider
+                if not await provider.is_connected():
+                    await provider.connect()
+                
+                await self.async_w3.eth.subscribe("newHeads")
+                logger.info("Subscribed to newHeads for gas price updates")
+                delay = GAS_RESUBSCRIBE_DELAY
+                
+                async for _ in self.async_w3.socket.process_subscriptions():
+                    try:
+                        self._fee_cache = None  # new block: refetch fee history on next use
+                        gas_price = await self.async_w3.eth.gas_price
+                        self._pushed_gas_price = (gas_price, time.monotonic())
+                    except Exception as e:
+                        logger.warning(f"Gas price refresh failed: {e}")
+                
+                logger.warning("newHeads subscription ended")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"newHeads subscription failed: {e}")
+            
+            logger.info(f"Resubscribing to newHeads in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, GAS_RESUBSCRIBE_MAX_DELAY)
+    
+    @staticmethod
+    def _on_gas_task_done(task: asyncio.Task):
+        """Log a gas subscription task that stopped for any reason but cancellation"""
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            logger.error(f"Gas price subscription stopped: {error!r}")
+        else:
+            logger.warning("Gas price subscription stopped")
+    
+    def get_fee_suggestions(self) -> Optional[Tuple[int, int]]:
+        """
+        Suggest EIP-1559 fees from one eth_feeHistory call, cached per block
+        
+        The priority fee is the median tip of recent blocks bumped by 10.1%;
+        the max fee covers a doubling of the next block's base fee.
+        
+        Returns:
+            tuple: (maxFeePerGas, maxPriorityFeePerGas) in wei, or None if
+                the chain has no base fee (pre-London)
+        """
+        now = time.monotonic()
+        if self._fee_cache and now - self._fee_cache[1] < FEE_HISTORY_TTL:
+            return self._fee_cache[0]
+        
+        history = self.acquire().eth.fee_history(
+            FEE_HISTORY_BLOCKS, "latest", FEE_HISTORY_PERCENTILES
+        )
+        base_fees = history.get("baseFeePerGas") or []
+        
+        if not any(base_fees):
+            suggestion = None
+        else:
+            tips = sorted(reward[1] for reward in history.get("reward") or []) or [0]
+            priority_fee = (tips[len(tips) // 2] * 1101) // 1000
+            suggestion = (2 * base_fees[-1] + priority_fee, priority_fee)
+        
+        self._fee_cache = (suggestion, now)
+        return suggestion
+    
+    def pushed_gas_price(self) -> Optional[int]:
+        """Return the subscription-fed gas price if it is still fresh"""
+        if self._pushed_gas_price and time.monotonic() - self._pushed_gas_price[1] < PUSHED_GAS_PRICE_TTL:
+            return self._pushed_gas_price[0]
+        return None
+    
     async def disconnect(self):
         """Close Web3 connection"""
+        if self._gas_task:
+            self._gas_task.cancel()
+            self._gas_task = None
         if self.w3 and hasattr(self.w3.provider, 'disconnect'):
             await self.w3.provider.disconnect()
+        if self.async_w3 and hasattr(self.async_w3.provider, 'disconnect'):
+            await self.async_w3.provider.disconnect()
         logger.info("Web3 connection closed")
     
     def is_connected(self) -> bool:
@@ -130,13 +506,31 @@ class Web3Manager:
         if not self.is_connected():
             return {"status": "disconnected"}
         
+        # Block number, gas price and (first time only) chain ID in one batch
+        gas_price = self.pushed_gas_price()
+        calls = [("eth_blockNumber", [])]
+        if gas_price is None:
+            calls.append(("eth_gasPrice", []))
+        if self._chain_id is None:
+            calls.append(("eth_chainId", []))
+        
+        results = dict(zip((method for method, _ in calls), self.batch_call(calls)))
+        for result in results.values():
+            if isinstance(result, Exception):
+                raise result
+        
+        if gas_price is None:
+            gas_price = int(results["eth_gasPrice"], 16)
+        if self._chain_id is None:
+            self._chain_id = int(results["eth_chainId"], 16)
+        
         return {
             "network": self.network,
             "name": self.network_info.get("name", "Unknown"),
-            "chain_id": self.w3.eth.chain_id,
+            "chain_id": self._chain_id,
             "currency": self.network_info.get("currency", "ETH"),
-            "block_number": self.w3.eth.block_number,
-            "gas_price": self.w3.eth.gas_price,
+            "block_number": int(results["eth_blockNumber"], 16),
+            "gas_price": gas_price,
             "explorer": self.network_info.get("explorer")
         }
     
@@ -153,15 +547,113 @@ class Web3Manager:
         if not self.is_connected():
             raise ConnectionError("Web3 not connected")
         
-        checksum_address = self.w3.to_checksum_address(address)
-        return self.w3.eth.get_balance(checksum_address)
+        checksum_address = checksum(address)
+        return self.acquire().eth.get_balance(checksum_address)
+    
+    def batch_call(self, calls: List[Tuple[str, List[Any]]]) -> List[Any]:
+        """
+        Send several JSON-RPC calls in one batch request
+        
+        Args:
+            calls: List of (method, params) pairs
+            
+        Returns:
+            list: Raw JSON result per call, in order; a failed call yields a
+                ValueError carrying the node's error instead of a result
+        """
+        if not self.is_connected():
+            raise ConnectionError("Web3 not connected")
+        
+        responses = self.acquire().provider.make_batch_request(calls)
+        
+        # A node that rejects the whole batch answers with one error object
+        # instead of a list; fail every call so per-entry fallbacks still run
+        if isinstance(responses, Mapping):
+            error = responses.get("error") or responses
+            logger.debug("Batch of %d calls rejected: %s", len(calls), error)
+            return [ValueError(error) for _ in calls]
+        
+        results: List[Any] = []
+        for (method, _), response in zip(calls, responses):
+            if "error" in response or response.get("result") is None:
+                logger.debug("Batched %s failed: %s", method, response.get('error'))
+                results.append(ValueError(response.get("error") or f"{method} returned no result"))
+            else:
+                results.append(response["result"])
+        # Calls the node dropped from its reply fail individually as well
+        for method, _ in calls[len(results):]:
+            results.append(ValueError(f"{method} returned no response"))
+        return results
+    
+    def multicall(
+        self,
+        calls: List[Tuple[str, bytes]],
+        allow_failure: bool = True
+    ) -> List[Optional[bytes]]:
+        """
+        Execute read-only calls in a single eth_call via Multicall3 aggregate3
+        
+        Args:
+            calls: List of (target address, calldata) pairs
+            allow_failure: If False, any reverting call reverts the whole batch
+            
+        Returns:
+            list: Return data per call, None for calls that reverted
+        """
+        payload = AGGREGATE3_SELECTOR + encode(
+            ['(address,bool,bytes)[]'],
+            [[(target, allow_failure, data) for target, data in calls]]
+        )
+        raw = self.acquire().eth.call({'to': MULTICALL3_ADDRESS, 'data': payload})
+        (results,) = decode(['(bool,bytes)[]'], raw)
+        return [data if success else None for success, data in results]
     
-    def get_transaction_count(self, address: str) -> int:
+    def batch_preflight(
+        self,
+        from_address: str,
+        to_address: str,
+        value: int = 0,
+        data: str = "0x"
+    ) -> Dict[str, Optional[int]]:
+        """
+        Fetch nonce, gas estimate and gas price in a single JSON-RPC batch
+        
+        Args:
+            from_address: Sender address
+            to_address: Recipient address
+            value: Amount in wei
+            data: Transaction data
+            
+        Returns:
+            dict: nonce, gas (raw estimate) and gas_price; None for any call
+                that failed within the batch
+        """
+        from_checksum = checksum(from_address)
+        to_checksum = checksum(to_address)
+        
+        results = self.batch_call([
+            ("eth_getTransactionCount", [from_checksum, "pending"]),
+            ("eth_estimateGas", [{
+                "from": from_checksum,
+                "to": to_checksum,
+                "value": hex(value),
+                "data": data
+            }]),
+            ("eth_gasPrice", []),
+        ])
+        
+        return {
+            key: None if isinstance(result, Exception) else int(result, 16)
+            for key, result in zip(("nonce", "gas", "gas_price"), results)
+        }
+    
+    def get_transaction_count(self, address: str, block_identifier: str = "latest") -> int:
         """
         Get transaction count (nonce) for an address
         
         Args:
             address: Ethereum address
+            block_identifier: Block to read at ("pending" includes mempool txs)
             
         Returns:
             int: Transaction count
@@ -169,10 +661,10 @@ class Web3Manager:
         if not self.is_connected():
             raise ConnectionError("Web3 not connected")
         
-        checksum_address = self.w3.to_checksum_address(address)
-        return self.w3.eth.get_transaction_count(checksum_address)
+        checksum_address = checksum(address)
+        return self.acquire().eth.get_transaction_count(checksum_address, block_identifier)
     
-    def get_transaction(self, tx_hash: str) -> Dict[str, Any]:
+    def get_transaction(self, tx_hash: str) -> Any:
         """
         Get transaction details
         
@@ -180,14 +672,14 @@ class Web3Manager:
             tx_hash: Transaction hash
             
         Returns:
-            dict: Transaction details
+            AttributeDict: Transaction details
         """
         if not self.is_connected():
             raise ConnectionError("Web3 not connected")
         
-        return dict(self.w3.eth.get_transaction(tx_hash))
+        return self.acquire().eth.get_transaction(tx_hash)
     
-    def get_transaction_receipt(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+    def get_transaction_receipt(self, tx_hash: str) -> Optional[Any]:
         """
         Get transaction receipt
         
@@ -195,24 +687,75 @@ class Web3Manager:
             tx_hash: Transaction hash
             
         Returns:
-            dict: Transaction receipt or None if not mined
+            AttributeDict: Transaction receipt or None if not mined
         """
         if not self.is_connected():
             raise ConnectionError("Web3 not connected")
         
         try:
-            receipt = self.w3.eth.get_transaction_receipt(tx_hash)
-            return dict(receipt) if receipt else None
+            return self.acquire().eth.get_transaction_receipt(tx_hash) or None
+        except Exception:
+            return None
+    
+    async def aget_balance(self, address: str) -> int:
+        """Async get_balance; does not block the event loop"""
+        if self.async_w3 is None:
+            return await asyncio.to_thread(self.get_balance, address)
+        return await self.async_w3.eth.get_balance(checksum(address))
+    
+    async def aget_transaction_count(self, address: str, block_identifier: str = "latest") -> int:
+        """Async get_transaction_count; does not block the event loop"""
+        if self.async_w3 is None:
+            return await asyncio.to_thread(self.get_transaction_count, address, block_identifier)
+        return await self.async_w3.eth.get_transaction_count(
+            checksum(address), block_identifier
+        )
+    
+    async def aget_transaction_receipt(self, tx_hash: str) -> Optional[Any]:
+        """Async get_transaction_receipt; does not block the event loop"""
+        if self.async_w3 is None:
+            return await asyncio.to_thread(self.get_transaction_receipt, tx_hash)
+        try:
+            return await self.async_w3.eth.get_transaction_receipt(tx_hash) or None
         except Exception:
             return None
     
+    async def aestimate_gas(self, transaction: Dict[str, Any]) -> int:
+        """
+        Estimate gas for a transaction without blocking the event loop
+        
+        Args:
+            transaction: Transaction parameters (from, to, value, data)
+            
+        Returns:
+            int: Estimated gas (no buffer)
+        """
+        if self.async_w3 is None:
+            return await asyncio.to_thread(self.acquire().eth.estimate_gas, transaction)
+        return await self.async_w3.eth.estimate_gas(transaction)
+    
+    async def aget_gas_price(self) -> int:
+        """Get current gas price without blocking the event loop"""
+        pushed = self.pushed_gas_price()
+        if pushed is not None:
+            return pushed
+        if self.async_w3 is None:
+            return await asyncio.to_thread(lambda: self.acquire().eth.gas_price)
+        return await self.async_w3.eth.gas_price
+    
     def wei_to_ether(self, wei: int) -> float:
-        """Convert wei to ether"""
-        return float(self.w3.from_wei(wei, 'ether'))
+        """Convert wei to ether (float, display precision)"""
+        return wei / WEI_PER_ETHER
     
     def ether_to_wei(self, ether: float) -> int:
-        """Convert ether to wei"""
-        return self.w3.to_wei(ether, 'ether')
+        """Convert ether to wei (exact for int, float, Decimal and str amounts)"""
+        if isinstance(ether, int):
+            return ether * WEI_PER_ETHER
+        if isinstance(ether, float):
+            # repr() is the shortest decimal that round-trips, so 1.1 -> "1.1"
+            # rather than the binary value 1.100000000000000088817...
+            ether = repr(ether)
+        return int(Decimal(ether) * WEI_PER_ETHER)
     
     async def broadcast_raw_transaction(self, signed_tx_hex: str) -> str:
         """
@@ -225,7 +768,7 @@ class Web3Manager:
             str: Transaction hash
         """
         try:
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx_hex)
+            tx_hash = self.acquire().eth.send_raw_transaction(signed_tx_hex)
             logger.info(f"Transaction broadcasted: {tx_hash.hex()}")
             return tx_hash.hex()
         except Exception as e:
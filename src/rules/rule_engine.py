@@ -4,13 +4,35 @@ Automated safety controls and risk management
 """
 import logging
 import sqlite3
-from typing import Dict, Any, List, Optional, Tuple
-from datetime import datetime, timedelta
+import threading
+import time
+from typing import Callable, Dict, Any, List, Optional, Set, Tuple
+from datetime import datetime
 from enum import Enum
 import json
 
 logger = logging.getLogger(__name__)
 
+# Senders per grouped context query, well under SQLite's bound-parameter limit
+CONTEXT_QUERY_CHUNK = 500
+
+# Statements are issued with stable SQL text so sqlite3's per-connection
+# statement cache reuses the prepared forms
+STATEMENT_CACHE_SIZE = 256
+
+# Matches SQLite's CURRENT_TIMESTAMP, which the audit logger uses for
+# transactions.timestamp, so window cutoffs compare correctly as text
+SQLITE_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+SECONDS_PER_DAY = 86400
+
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-20000",
+)
+
 
 class RuleType(Enum):
     """Types of rules that can be applied"""
@@ -37,9 +59,104 @@ class RiskLevel(Enum):
     CRITICAL = "critical"
 
 
+# Integer codes for the evaluation hot path; the Enums stay the public API
+(_RT_SPENDING_LIMIT, _RT_WHITELIST, _RT_BLACKLIST,
+ _RT_TIME_RESTRICTION, _RT_AMOUNT_THRESHOLD, _RT_DAILY_COUNT) = range(6)
+
+_TYPE_MAP = {
+    RuleType.SPENDING_LIMIT.value: _RT_SPENDING_LIMIT,
+    RuleType.ADDRESS_WHITELIST.value: _RT_WHITELIST,
+    RuleType.ADDRESS_BLACKLIST.value: _RT_BLACKLIST,
+    RuleType.TIME_RESTRICTION.value: _RT_TIME_RESTRICTION,
+    RuleType.AMOUNT_THRESHOLD.value: _RT_AMOUNT_THRESHOLD,
+    RuleType.DAILY_TRANSACTION_COUNT.value: _RT_DAILY_COUNT,
+}
+
+# Action codes ordered by restrictiveness, so the combined action is the max
+_ACTION_ALLOW, _ACTION_REQUIRE_APPROVAL, _ACTION_DENY = range(3)
+
+_ACTION_MAP = {
+    RuleAction.ALLOW.value: _ACTION_ALLOW,
+    RuleAction.REQUIRE_APPROVAL.value: _ACTION_REQUIRE_APPROVAL,
+    RuleAction.DENY.value: _ACTION_DENY,
+}
+
+_ACTION_VALUES = (
+    RuleAction.ALLOW.value,
+    RuleAction.REQUIRE_APPROVAL.value,
+    RuleAction.DENY.value,
+)
+
+
+def _normalize_transaction(transaction: Dict[str, Any]) -> Dict[str, Any]:
+    """Coerce the fields rules read into their canonical types once per evaluation"""
+    tx = dict(transaction)
+    tx['value'] = float(transaction.get('value', 0))
+    tx['to_address'] = (transaction.get('to_address') or '').lower()
+    tx['from_address'] = transaction.get('from_address', '')
+    tx['tx_hash'] = transaction.get('tx_hash', 'pending')
+    return tx
+
+
+# Most the daily frequency can add to a risk score
+FREQUENCY_RISK_MAX = 20
+
+
+def _base_risk_score(failed_count: int, value: float) -> int:
+    """Score a transaction from its failed rule count and amount"""
+    # Failed rules increase risk
+    score = failed_count * 25
+    
+    # Large transaction amount
+    if value > 10:
+        score += 30
+    elif value > 1:
+        score += 15
+    elif value > 0.1:
+        score += 5
+    
+    return score
+
+
+def _frequency_risk_score(daily_count: int) -> int:
+    """Score a sender's daily transaction frequency"""
+    # High transaction frequency
+    if daily_count > 50:
+        return FREQUENCY_RISK_MAX
+    elif daily_count > 20:
+        return 10
+    return 0
+
+
+def _risk_score(failed_count: int, value: float, daily_count: int) -> int:
+    """Score a transaction from its failed rule count, amount and daily frequency"""
+    return _base_risk_score(failed_count, value) + _frequency_risk_score(daily_count)
+
+
+def _risk_level(score: int) -> RiskLevel:
+    """Map a risk score to its level"""
+    if score >= 75:
+        return RiskLevel.CRITICAL
+    elif score >= 50:
+        return RiskLevel.HIGH
+    elif score >= 25:
+        return RiskLevel.MEDIUM
+    return RiskLevel.LOW
+
+
 class Rule:
     """Represents a single rule"""
     
+    # Rule type code -> check handler, resolved once per rule in __init__
+    _DISPATCH = {
+        _RT_SPENDING_LIMIT: lambda self, t, c: self._check_spending_limit(t, c),
+        _RT_WHITELIST: lambda self, t, c: self._check_whitelist(t),
+        _RT_BLACKLIST: lambda self, t, c: self._check_blacklist(t),
+        _RT_TIME_RESTRICTION: lambda self, t, c: self._check_time_restriction(),
+        _RT_AMOUNT_THRESHOLD: lambda self, t, c: self._check_amount_threshold(t),
+        _RT_DAILY_COUNT: lambda self, t, c: self._check_daily_count(c),
+    }
+    
     def __init__(
         self,
         rule_id: int,
@@ -57,37 +174,57 @@ class Rule:
         self.action = RuleAction(action)
         self.enabled = enabled
         self.priority = priority
+        self._type_code = _TYPE_MAP[self.rule_type.value]
+        self._action_code = _ACTION_MAP[self.action.value]
+        self._check_fn = self._DISPATCH[self._type_code]
+        
+        # Numeric parameters are parsed once rather than on every check
+        self._limit_type = parameters.get('type', 'daily')  # daily, weekly, monthly, per_transaction
+        if self._type_code == _RT_SPENDING_LIMIT:
+            self._limit_amount = float(parameters.get('amount', 0))
+        elif self._type_code == _RT_AMOUNT_THRESHOLD:
+            self._threshold = float(parameters.get('threshold', 0))
+        elif self._type_code == _RT_DAILY_COUNT:
+            self._max_count = int(parameters.get('max_count', 10))
+        
+        # Period spending limits and daily counts read sender history
+        self.needs_context = (
+            self._type_code == _RT_DAILY_COUNT
+            or (self._type_code == _RT_SPENDING_LIMIT and self._limit_type != 'per_transaction')
+        )
+        self._address_set: frozenset = frozenset()
+        if self._type_code in (_RT_WHITELIST, _RT_BLACKLIST):
+            self._address_set = frozenset(addr.lower() for addr in parameters.get('addresses', []))
+        
+        if self._type_code == _RT_TIME_RESTRICTION:
+            allowed_hours = parameters.get('allowed_hours', '00:00-23:59')
+            timezone = parameters.get('timezone', 'UTC')
+            start_time, end_time = allowed_hours.split('-')
+            self._start_hour = int(start_time.split(':')[0])
+            self._end_hour = int(end_time.split(':')[0])
+            self._time_denied_reason = f"Outside allowed time window ({allowed_hours} {timezone})"
     
     def check(self, transaction: Dict[str, Any], context: Dict[str, Any]) -> Tuple[bool, str]:
         """
         Check if transaction passes this rule
         
+        Args:
+            transaction: Transaction normalized by _normalize_transaction
+            context: Evaluation context (period spending, tx count)
+        
         Returns:
             Tuple[bool, str]: (passes, reason)
         """
         if not self.enabled:
             return True, "Rule disabled"
         
-        if self.rule_type == RuleType.SPENDING_LIMIT:
-            return self._check_spending_limit(transaction, context)
-        elif self.rule_type == RuleType.ADDRESS_WHITELIST:
-            return self._check_whitelist(transaction)
-        elif self.rule_type == RuleType.ADDRESS_BLACKLIST:
-            return self._check_blacklist(transaction)
-        elif self.rule_type == RuleType.TIME_RESTRICTION:
-            return self._check_time_restriction()
-        elif self.rule_type == RuleType.AMOUNT_THRESHOLD:
-            return self._check_amount_threshold(transaction)
-        elif self.rule_type == RuleType.DAILY_TRANSACTION_COUNT:
-            return self._check_daily_count(context)
-        
-        return True, "Unknown rule type"
+        return self._check_fn(self, transaction, context)
     
     def _check_spending_limit(self, transaction: Dict[str, Any], context: Dict[str, Any]) -> Tuple[bool, str]:
         """Check spending limit rule"""
-        limit_type = self.parameters.get('type', 'daily')  # daily, weekly, monthly, per_transaction
-        limit_amount = float(self.parameters.get('amount', 0))
-        tx_amount = float(transaction.get('value', 0))
+        limit_type = self._limit_type
+        limit_amount = self._limit_amount
+        tx_amount = transaction['value']
         
         if limit_type == 'per_transaction':
             if tx_amount > limit_amount:
@@ -105,45 +242,35 @@ class Rule:
     
     def _check_whitelist(self, transaction: Dict[str, Any]) -> Tuple[bool, str]:
         """Check address whitelist"""
-        allowed_addresses = [addr.lower() for addr in self.parameters.get('addresses', [])]
-        to_address = transaction.get('to_address', '').lower()
+        to_address = transaction['to_address']
         
-        if to_address in allowed_addresses:
+        if to_address in self._address_set:
             return True, "Address is whitelisted"
         
         return False, f"Address {to_address} not in whitelist"
     
     def _check_blacklist(self, transaction: Dict[str, Any]) -> Tuple[bool, str]:
         """Check address blacklist"""
-        blocked_addresses = [addr.lower() for addr in self.parameters.get('addresses', [])]
-        to_address = transaction.get('to_address', '').lower()
+        to_address = transaction['to_address']
         
-        if to_address in blocked_addresses:
+        if to_address in self._address_set:
             return False, f"Address {to_address} is blacklisted"
         
         return True, "Address not blacklisted"
     
     def _check_time_restriction(self) -> Tuple[bool, str]:
         """Check time-based restrictions"""
-        allowed_hours = self.parameters.get('allowed_hours', '00:00-23:59')
-        timezone = self.parameters.get('timezone', 'UTC')
-        
-        # Simple implementation - parse hours
-        start_time, end_time = allowed_hours.split('-')
-        start_hour = int(start_time.split(':')[0])
-        end_hour = int(end_time.split(':')[0])
+        current_hour = time.gmtime().tm_hour  # Simplified - should use proper timezone
         
-        current_hour = datetime.utcnow().hour  # Simplified - should use proper timezone
-        
-        if start_hour <= current_hour <= end_hour:
+        if self._start_hour <= current_hour <= self._end_hour:
             return True, "Within allowed time window"
         
-        return False, f"Outside allowed time window ({allowed_hours} {timezone})"
+        return False, self._time_denied_reason
     
     def _check_amount_threshold(self, transaction: Dict[str, Any]) -> Tuple[bool, str]:
         """Check amount threshold for approval requirement"""
-        threshold = float(self.parameters.get('threshold', 0))
-        tx_amount = float(transaction.get('value', 0))
+        threshold = self._threshold
+        tx_amount = transaction['value']
         
         if tx_amount >= threshold:
             return False, f"Amount ({tx_amount}) exceeds threshold ({threshold}) - requires approval"
@@ -152,7 +279,7 @@ class Rule:
     
     def _check_daily_count(self, context: Dict[str, Any]) -> Tuple[bool, str]:
         """Check daily transaction count"""
-        max_count = int(self.parameters.get('max_count', 10))
+        max_count = self._max_count
         current_count = context.get('daily_transaction_count', 0)
         
         if current_count >= max_count:
@@ -161,20 +288,173 @@ class Rule:
         return True, f"Within daily transaction limit ({current_count}/{max_count})"
 
 
+def _compile_rules(
+    rules: List[Rule],
+    load_context: Callable[[Dict[str, Any]], Dict[str, Any]]
+) -> Callable:
+    """
+    Generate one specialized check function for an ordered rule set
+    
+    Each rule's check is inlined with its parameters pre-parsed and bound as
+    constants, so evaluation runs straight-line code with no per-rule
+    dispatch. Rule parameters are only ever bound as namespace values, never
+    interpolated into the generated source. Outcomes and reasons match
+    Rule.check.
+    
+    Args:
+        rules: Enabled rules in evaluation order
+        load_context: Builds sender context for a normalized transaction
+    
+    Returns:
+        check_all(tx, ctx, short_circuit) -> (outcomes, action_code, ctx, short_circuited),
+        where outcomes holds a (passed, reason) pair per evaluated rule and
+        ctx is None if no evaluated rule needed it
+    """
+    namespace: Dict[str, Any] = {"_load": load_context, "_gmtime": time.gmtime}
+    lines = [
+        "def check_all(tx, ctx, short_circuit):",
+        "    out = []",
+        "    append = out.append",
+        "    action = 0",
+        "    value = tx['value']",
+        "    to_address = tx['to_address']",
+    ]
+    
+    for i, rule in enumerate(rules):
+        code = rule._type_code
+        lines.append(f"    # rule {i}")
+        
+        if rule.needs_context:
+            lines.append("    if ctx is None:")
+            lines.append("        ctx = _load(tx)")
+        
+        if code == _RT_SPENDING_LIMIT:
+            limit_type = rule._limit_type
+            namespace[f"_lim{i}"] = rule._limit_amount
+            if limit_type == 'per_transaction':
+                lines += [
+                    f"    if value > _lim{i}:",
+                    f"        ok = False; reason = f'Transaction amount ({{value}}) exceeds per-transaction limit ({{_lim{i}}})'",
+                    "    else:",
+                    "        ok = True; reason = 'Within per-transaction limit'",
+                ]
+            else:
+                namespace[f"_type{i}"] = limit_type
+                namespace[f"_key{i}"] = f'{limit_type}_spending'
+                namespace[f"_ok{i}"] = f"Within {limit_type} limit"
+                lines += [
+                    f"    spent = ctx.get(_key{i}, 0)",
+                    f"    if spent + value > _lim{i}:",
+                    f"        ok = False; reason = f'Would exceed {{_type{i}}} limit ({{_lim{i}}}). Current: {{spent}}, Transaction: {{value}}'",
+                    "    else:",
+                    f"        ok = True; reason = _ok{i}",
+                ]
+        elif code == _RT_WHITELIST:
+            namespace[f"_set{i}"] = rule._address_set
+            lines += [
+                f"    if to_address in _set{i}:",
+                "        ok = True; reason = 'Address is whitelisted'",
+                "    else:",
+                "        ok = False; reason = f'Address {to_address} not in whitelist'",
+            ]
+        elif code == _RT_BLACKLIST:
+            namespace[f"_set{i}"] = rule._address_set
+            lines += [
+                f"    if to_address in _set{i}:",
+                "        ok = False; reason = f'Address {to_address} is blacklisted'",
+                "    else:",
+                "        ok = True; reason = 'Address not blacklisted'",
+            ]
+        elif code == _RT_TIME_RESTRICTION:
+            namespace[f"_start{i}"] = rule._start_hour
+            namespace[f"_end{i}"] = rule._end_hour
+            namespace[f"_denied{i}"] = rule._time_denied_reason
+            lines += [
+                f"    if _start{i} <= _gmtime().tm_hour <= _end{i}:",
+                "        ok = True; reason = 'Within allowed time window'",
+                "    else:",
+                f"        ok = False; reason = _denied{i}",
+            ]
+        elif code == _RT_AMOUNT_THRESHOLD:
+            namespace[f"_thr{i}"] = rule._threshold
+            lines += [
+                f"    if value >= _thr{i}:",
+                f"        ok = False; reason = f'Amount ({{value}}) exceeds threshold ({{_thr{i}}}) - requires approval'",
+                "    else:",
+                "        ok = True; reason = 'Below threshold'",
+            ]
+        elif code == _RT_DAILY_COUNT:
+            namespace[f"_max{i}"] = rule._max_count
+            lines += [
+                "    count = ctx.get('daily_transaction_count', 0)",
+                f"    if count >= _max{i}:",
+                f"        ok = False; reason = f'Daily transaction limit reached ({{_max{i}}})'",
+                "    else:",
+                f"        ok = True; reason = f'Within daily transaction limit ({{count}}/{{_max{i}}})'",
+            ]
+        
+        lines.append("    append((ok, reason))")
+        if rule._action_code != _ACTION_ALLOW:
+            lines.append("    if not ok:")
+            lines.append(f"        if action < {rule._action_code}:")
+            lines.append(f"            action = {rule._action_code}")
+            if rule._action_code == _ACTION_DENY:
+                lines.append("        if short_circuit:")
+                lines.append("            return out, action, ctx, True")
+    
+    lines.append("    return out, action, ctx, False")
+    
+    exec(compile("\n".join(lines), "<rules>", "exec"), namespace)
+    return namespace["check_all"]
+
+
 class RuleEngine:
     """
     Main Rule Engine - evaluates transactions against rules
     """
     
-    def __init__(self, db_path: str = "chainpilot.db"):
+    def __init__(self, db_path: str = "chainpilot.db", short_circuit_deny: bool = False):
         self.db_path = db_path
+        self.short_circuit_deny = short_circuit_deny
+        self._rules_cache: Optional[List[Rule]] = None
+        self._evaluation_rules: Optional[List[Rule]] = None
+        self._compiled_check: Optional[Callable] = None
+        self._priority_order: Optional[List[int]] = None
+        self._parsed_rules: Dict[int, Tuple[str, Rule]] = {}
+        self._rules_version = 0
+        # One shared connection in autocommit mode; the lock serializes access
+        # from the threadpool that runs sync routes
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._configure_connection()
         self._initialize_database()
-        logger.info(f"Rule Engine initialized with database: {db_path}")
+        logger.info("Rule Engine initialized with database: %s", db_path)
+    
+    async def disconnect(self):
+        """Close the database connection"""
+        with self._lock:
+            # Refresh planner statistics for tables whose indexes saw use
+            self._conn.execute("PRAGMA optimize")
+            self._conn.close()
+        logger.info("Rule engine disconnected")
+    
+    def _configure_connection(self):
+        """Apply connection pragmas tuned for frequent small writes"""
+        # WAL lets evaluation logging commit without a full fsync per write;
+        # the rest keep temp tables, hot pages and the file mapping in memory
+        for pragma in SQLITE_PRAGMAS:
+            self._conn.execute(pragma)
     
     def _initialize_database(self):
         """Initialize rules database"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._lock:
+            cursor = self._conn.cursor()
             
             # Create rules table
             cursor.execute("""
@@ -205,7 +485,16 @@ class RuleEngine:
                 )
             """)
             
-            conn.commit()
+            # Indexes for rule loading and the evaluation audit trail
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_rules_enabled_priority
+                ON rules(enabled, priority DESC)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_rule_eval_tx
+                ON rule_evaluations(tx_hash)
+            """)
+            
             logger.info("Rule engine database initialized")
     
     def create_rule(
@@ -218,8 +507,8 @@ class RuleEngine:
         priority: int = 0
     ) -> int:
         """Create a new rule"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._lock:
+            cursor = self._conn.cursor()
             
             now = datetime.utcnow().isoformat()
             cursor.execute(
@@ -231,17 +520,81 @@ class RuleEngine:
             )
             
             rule_id = cursor.lastrowid
-            conn.commit()
+            self._invalidate_rules_cache()
             
-            logger.info(f"Created rule: {rule_name} (ID: {rule_id}, Type: {rule_type})")
+            logger.info("Created rule: %s (ID: %s, Type: %s)", rule_name, rule_id, rule_type)
             return rule_id
     
+    def _invalidate_rules_cache(self):
+        """Drop the cached enabled rules so the next evaluation reloads them"""
+        with self._lock:
+            self._rules_cache = None
+            self._evaluation_rules = None
+            self._compiled_check = None
+            self._priority_order = None
+            self._rules_version += 1
+    
     def get_rules(self, enabled_only: bool = True) -> List[Rule]:
-        """Get all rules"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        """
+        Get all rules
+        
+        Enabled rules are cached in memory until a rule is created, updated
+        or deleted, so repeated evaluations do not touch SQLite.
+        """
+        if enabled_only:
+            with self._lock:
+                if self._rules_cache is None:
+                    self._rules_cache = self._load_rules(enabled_only=True)
+                return self._rules_cache
+        
+        return self._load_rules(enabled_only=False)
+    
+    def _get_evaluation_rules(self) -> Tuple[List[Rule], Callable, List[int]]:
+        """
+        Get enabled rules in evaluation order with their compiled check
+        
+        Rules that need no sender history run first, keeping priority order
+        within each group, so a DENY from e.g. a blacklist can settle the
+        outcome before any context query is made. The specialized check
+        function is regenerated whenever the rule cache is invalidated.
+        
+        Returns:
+            (rules, check_all, priority_order), where priority_order lists
+            evaluation indices in priority order for reporting
+        """
+        with self._lock:
+            if self._evaluation_rules is None or self._compiled_check is None:
+                rules = self.get_rules(enabled_only=True)
+                order = (
+                    [i for i, rule in enumerate(rules) if not rule.needs_context]
+                    + [i for i, rule in enumerate(rules) if rule.needs_context]
+                )
+                self._evaluation_rules = [rules[i] for i in order]
+                self._priority_order = sorted(range(len(order)), key=order.__getitem__)
+                self._compiled_check = _compile_rules(self._evaluation_rules, self._build_context)
+            return self._evaluation_rules, self._compiled_check, self._priority_order
+    
+    def get_rule_ids(self, enabled_only: bool = True) -> List[int]:
+        """Get rule IDs in priority order without materializing Rule objects"""
+        query = "SELECT id FROM rules"
+        if enabled_only:
+            query += " WHERE enabled = 1"
+        query += " ORDER BY priority DESC"
+        
+        with self._lock:
+            return [row["id"] for row in self._conn.execute(query)]
+    
+    def _load_rules(self, enabled_only: bool) -> List[Rule]:
+        """
+        Load rules from the database
+        
+        Parsed Rule objects are memoized by (id, updated_at), so parameters
+        are only JSON-decoded and preprocessed when a rule actually changes.
+        """
+        with self._lock:
+            cursor = self._conn.cursor()
             
-            query = "SELECT id, rule_type, rule_name, parameters, action, enabled, priority FROM rules"
+            query = "SELECT id, rule_type, rule_name, parameters, action, enabled, priority, updated_at FROM rules"
             if enabled_only:
                 query += " WHERE enabled = 1"
             query += " ORDER BY priority DESC"
@@ -251,23 +604,37 @@ class RuleEngine:
             
             rules = []
             for row in rows:
+                cached = self._parsed_rules.get(row["id"])
+                if cached is not None and cached[0] == row["updated_at"]:
+                    rules.append(cached[1])
+                    continue
+                
                 rule = Rule(
-                    rule_id=row[0],
-                    rule_type=row[1],
-                    rule_name=row[2],
-                    parameters=json.loads(row[3]),
-                    action=row[4],
-                    enabled=bool(row[5]),
-                    priority=row[6]
+                    rule_id=row["id"],
+                    rule_type=row["rule_type"],
+                    rule_name=row["rule_name"],
+                    parameters=json.loads(row["parameters"]),
+                    action=row["action"],
+                    enabled=bool(row["enabled"]),
+                    priority=row["priority"]
                 )
+                self._parsed_rules[row["id"]] = (row["updated_at"], rule)
                 rules.append(rule)
             
+            if not enabled_only:
+                # A full load sees every rule, so drop entries for deleted ones
+                live_ids = {row["id"] for row in rows}
+                for rule_id in list(self._parsed_rules):
+                    if rule_id not in live_ids:
+                        del self._parsed_rules[rule_id]
+            
             return rules
     
     def evaluate_transaction(
         self,
         transaction: Dict[str, Any],
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        short_circuit: Optional[bool] = None
     ) -> Dict[str, Any]:
         """
         Evaluate a transaction against all rules
@@ -275,6 +642,8 @@ class RuleEngine:
         Args:
             transaction: Transaction details (to_address, value, etc.)
             context: Additional context (recent spending, tx count, etc.)
+            short_circuit: Stop at the first failed DENY rule, since no later
+                rule can change the outcome (defaults to short_circuit_deny)
         
         Returns:
             Dict with evaluation result:
@@ -283,186 +652,258 @@ class RuleEngine:
             - risk_level: low, medium, high, critical
             - failed_rules: List of failed rule names
             - reasons: List of failure reasons
+            - not_evaluated: Rules skipped after a DENY was locked in
         """
-        if context is None:
-            context = self._build_context(transaction)
+        if short_circuit is None:
+            short_circuit = self.short_circuit_deny
+        
+        transaction = _normalize_transaction(transaction)
+        
+        # Context is built lazily, on the first rule that needs it
+        rules, check_all, priority_order = self._get_evaluation_rules()
+        evaluations = []
+        
+        result = self._evaluate_rules(
+            transaction, context, rules, check_all, priority_order, short_circuit,
+            datetime.utcnow().isoformat(), evaluations
+        )
+        
+        # Log all evaluations in a single transaction
+        self._log_evaluation(evaluations)
+        
+        logger.info("Transaction evaluation: %s (Risk: %s)", result['action'], result['risk_level'])
+        
+        return result
+    
+    def evaluate_transactions(
+        self,
+        transactions: List[Dict[str, Any]],
+        short_circuit: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate a batch of transactions against all rules
+        
+        Context for every distinct sender is fetched with one grouped query and
+        all evaluation rows are logged in a single write, so replaying or
+        backfilling history costs a constant number of SQLite round-trips.
+        
+        Args:
+            transactions: Transaction details, as for evaluate_transaction
+            short_circuit: Stop each evaluation at the first failed DENY rule
         
-        rules = self.get_rules(enabled_only=True)
+        Returns:
+            Evaluation results in the same order as transactions
+        """
+        if short_circuit is None:
+            short_circuit = self.short_circuit_deny
+        
+        txs = [_normalize_transaction(tx) for tx in transactions]
+        contexts = self._build_contexts({tx['from_address'] for tx in txs})
+        rules, check_all, priority_order = self._get_evaluation_rules()
+        
+        timestamp = datetime.utcnow().isoformat()
+        evaluations = []
+        results = [
+            self._evaluate_rules(
+                tx, contexts[tx['from_address']], rules, check_all, priority_order,
+                short_circuit, timestamp, evaluations
+            )
+            for tx in txs
+        ]
+        
+        self._log_evaluation(evaluations)
+        
+        logger.info("Evaluated %d transactions against %d rules", len(results), len(rules))
+        
+        return results
+    
+    def _evaluate_rules(
+        self,
+        transaction: Dict[str, Any],
+        context: Optional[Dict[str, Any]],
+        rules: List[Rule],
+        check_all: Callable,
+        priority_order: List[int],
+        short_circuit: bool,
+        timestamp: str,
+        evaluations: List[Tuple[str, int, str, int, str, str]]
+    ) -> Dict[str, Any]:
+        """
+        Run a normalized transaction through the rules, appending audit rows to evaluations
+        
+        A None context is built on demand, when the first rule that needs it
+        is reached or when the sender's daily frequency could change the risk
+        level. Failures and audit rows are reported in rule priority order.
+        """
+        outcomes, action, context, _ = check_all(transaction, context, short_circuit)
         
         failed_rules = []
         reasons = []
-        action = RuleAction.ALLOW
-        
-        # Evaluate each rule
-        for rule in rules:
-            passed, reason = rule.check(transaction, context)
-            
-            # Log evaluation
-            self._log_evaluation(
-                tx_hash=transaction.get('tx_hash', 'pending'),
-                rule_id=rule.rule_id,
-                rule_name=rule.rule_name,
-                passed=passed,
-                reason=reason
+        not_evaluated = []
+        tx_hash = transaction['tx_hash']
+        checked = len(outcomes)
+        
+        for i in priority_order:
+            rule = rules[i]
+            if i >= checked:
+                not_evaluated.append(rule.rule_name)
+                continue
+            passed, reason = outcomes[i]
+            evaluations.append(
+                (tx_hash, rule.rule_id, rule.rule_name, 1 if passed else 0, reason, timestamp)
             )
-            
             if not passed:
                 failed_rules.append(rule.rule_name)
                 reasons.append(reason)
-                
-                # Determine action (most restrictive wins)
-                if rule.action == RuleAction.DENY:
-                    action = RuleAction.DENY
-                elif rule.action == RuleAction.REQUIRE_APPROVAL and action != RuleAction.DENY:
-                    action = RuleAction.REQUIRE_APPROVAL
         
-        # Calculate risk level
-        risk_level = self._calculate_risk(transaction, context, failed_rules)
+        # Frequency only raises the score, so the context query is skipped
+        # when even the maximum frequency score would not change the level
+        base_score = _base_risk_score(len(failed_rules), transaction['value'])
+        if context is None and _risk_level(base_score + FREQUENCY_RISK_MAX) != _risk_level(base_score):
+            context = self._build_context(transaction)
+        daily_count = context.get('daily_transaction_count', 0) if context else 0
+        risk_level = _risk_level(base_score + _frequency_risk_score(daily_count))
         
         # Determine if allowed
-        allowed = action == RuleAction.ALLOW
+        allowed = action == _ACTION_ALLOW
         
-        result = {
+        return {
             "allowed": allowed,
-            "action": action.value,
+            "action": _ACTION_VALUES[action],
             "risk_level": risk_level.value,
             "failed_rules": failed_rules,
             "reasons": reasons,
-            "rules_checked": len(rules),
-            "rules_passed": len(rules) - len(failed_rules)
+            "rules_checked": checked,
+            "rules_passed": checked - len(failed_rules),
+            "not_evaluated": not_evaluated
         }
-        
-        logger.info(f"Transaction evaluation: {result['action']} (Risk: {result['risk_level']})")
-        
-        return result
     
     def _build_context(self, transaction: Dict[str, Any]) -> Dict[str, Any]:
         """Build context for rule evaluation"""
         from_address = transaction.get('from_address', '')
+        return self._build_contexts({from_address})[from_address]
+    
+    def _build_contexts(self, from_addresses: Set[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Build rule evaluation context for several senders at once
         
-        # Get recent spending
-        daily_spending = self._get_period_spending(from_address, days=1)
-        weekly_spending = self._get_period_spending(from_address, days=7)
-        monthly_spending = self._get_period_spending(from_address, days=30)
-        
-        # Get transaction count
-        daily_tx_count = self._get_transaction_count(from_address, days=1)
+        Args:
+            from_addresses: Sender addresses to aggregate
         
-        return {
-            "daily_spending": daily_spending,
-            "weekly_spending": weekly_spending,
-            "monthly_spending": monthly_spending,
-            "daily_transaction_count": daily_tx_count
+        Returns:
+            Context dict per sender; senders without history get zeroed context
+        """
+        now = time.time()
+        daily_cutoff = time.strftime(SQLITE_TIMESTAMP_FORMAT, time.gmtime(now - SECONDS_PER_DAY))
+        weekly_cutoff = time.strftime(SQLITE_TIMESTAMP_FORMAT, time.gmtime(now - 7 * SECONDS_PER_DAY))
+        monthly_cutoff = time.strftime(SQLITE_TIMESTAMP_FORMAT, time.gmtime(now - 30 * SECONDS_PER_DAY))
+        
+        contexts = {
+            address: {
+                "daily_spending": 0.0,
+                "weekly_spending": 0.0,
+                "monthly_spending": 0.0,
+                "daily_transaction_count": 0
+            }
+            for address in from_addresses
         }
-    
-    def _get_period_spending(self, from_address: str, days: int) -> float:
-        """Get total spending for an address over a period"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
-            
-            cursor.execute(
-                """
-                SELECT COALESCE(SUM(CAST(value AS REAL)), 0)
-                FROM transactions
-                WHERE from_address = ? AND timestamp >= ? AND status IN ('confirmed', 'pending')
-                """,
-                (from_address, cutoff)
-            )
+        addresses = list(from_addresses)
+        
+        # Spending for every period and the daily count in one pass per chunk
+        # of senders, bounded by the widest (monthly) window
+        with self._lock:
+            cursor = self._conn.cursor()
             
-            result = cursor.fetchone()
-            return result[0] if result else 0.0
+            for start in range(0, len(addresses), CONTEXT_QUERY_CHUNK):
+                chunk = addresses[start:start + CONTEXT_QUERY_CHUNK]
+                placeholders = ", ".join("?" for _ in chunk)
+                cursor.execute(
+                    f"""
+                    SELECT
+                        from_address,
+                        COALESCE(SUM(CASE WHEN timestamp >= ? AND status IN ('confirmed', 'pending')
+                            THEN CAST(value AS REAL) ELSE 0 END), 0),
+                        COALESCE(SUM(CASE WHEN timestamp >= ? AND status IN ('confirmed', 'pending')
+                            THEN CAST(value AS REAL) ELSE 0 END), 0),
+                        COALESCE(SUM(CASE WHEN status IN ('confirmed', 'pending')
+                            THEN CAST(value AS REAL) ELSE 0 END), 0),
+                        COALESCE(SUM(CASE WHEN timestamp >= ? THEN 1 ELSE 0 END), 0)
+                    FROM transactions
+                    WHERE from_address IN ({placeholders}) AND timestamp >= ?
+                    GROUP BY from_address
+                    """,
+                    (daily_cutoff, weekly_cutoff, daily_cutoff, *chunk, monthly_cutoff)
+                )
+                
+                for row in cursor.fetchall():
+                    contexts[row[0]] = {
+                        "daily_spending": row[1],
+                        "weekly_spending": row[2],
+                        "monthly_spending": row[3],
+                        "daily_transaction_count": row[4]
+                    }
+        
+        return contexts
     
-    def _get_transaction_count(self, from_address: str, days: int) -> int:
-        """Get transaction count for an address over a period"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
-            
-            cursor.execute(
-                """
-                SELECT COUNT(*)
-                FROM transactions
-                WHERE from_address = ? AND timestamp >= ?
-                """,
-                (from_address, cutoff)
-            )
-            
-            result = cursor.fetchone()
-            return result[0] if result else 0
+    def bulk_rescore(self, rows: List[Dict[str, Any]]) -> List[str]:
+        """
+        Re-score many historical transactions without re-evaluating rules
+        
+        Args:
+            rows: Dicts with failed_count, value and daily_transaction_count
+        
+        Returns:
+            Risk level value for each row, in order
+        """
+        score = _risk_score
+        level = _risk_level
+        return [
+            level(score(
+                int(row.get('failed_count', 0)),
+                float(row.get('value', 0)),
+                int(row.get('daily_transaction_count', 0))
+            )).value
+            for row in rows
+        ]
     
-    def _calculate_risk(
-        self,
-        transaction: Dict[str, Any],
-        context: Dict[str, Any],
-        failed_rules: List[str]
-    ) -> RiskLevel:
-        """Calculate risk level for transaction"""
-        risk_score = 0
-        
-        # Failed rules increase risk
-        risk_score += len(failed_rules) * 25
-        
-        # Large transaction amount
-        value = float(transaction.get('value', 0))
-        if value > 10:
-            risk_score += 30
-        elif value > 1:
-            risk_score += 15
-        elif value > 0.1:
-            risk_score += 5
-        
-        # High transaction frequency
-        daily_count = context.get('daily_transaction_count', 0)
-        if daily_count > 50:
-            risk_score += 20
-        elif daily_count > 20:
-            risk_score += 10
-        
-        # Determine level
-        if risk_score >= 75:
-            return RiskLevel.CRITICAL
-        elif risk_score >= 50:
-            return RiskLevel.HIGH
-        elif risk_score >= 25:
-            return RiskLevel.MEDIUM
-        else:
-            return RiskLevel.LOW
-    
-    def _log_evaluation(
-        self,
-        tx_hash: str,
-        rule_id: int,
-        rule_name: str,
-        passed: bool,
-        reason: str
-    ):
-        """Log rule evaluation result"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute(
-                """
-                INSERT INTO rule_evaluations (tx_hash, rule_id, rule_name, passed, reason, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (tx_hash, rule_id, rule_name, 1 if passed else 0, reason, datetime.utcnow().isoformat())
-            )
+    def _log_evaluation(self, rows: List[Tuple[str, int, str, int, str, str]]):
+        """
+        Log rule evaluation results
+        
+        Args:
+            rows: (tx_hash, rule_id, rule_name, passed, reason, timestamp) tuples
+        """
+        if not rows:
+            return
+        
+        with self._lock:
+            cursor = self._conn.cursor()
             
-            conn.commit()
+            cursor.execute("BEGIN")
+            try:
+                cursor.executemany(
+                    """
+                    INSERT INTO rule_evaluations (tx_hash, rule_id, rule_name, passed, reason, timestamp)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    rows
+                )
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
     
     def delete_rule(self, rule_id: int) -> bool:
         """Delete a rule"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._lock:
+            cursor = self._conn.cursor()
             cursor.execute("DELETE FROM rules WHERE id = ?", (rule_id,))
             deleted = cursor.rowcount > 0
-            conn.commit()
             
             if deleted:
-                logger.info(f"Deleted rule ID: {rule_id}")
+                self._parsed_rules.pop(rule_id, None)
+                self._invalidate_rules_cache()
+                logger.info("Deleted rule ID: %s", rule_id)
             
             return deleted
     
@@ -474,37 +915,35 @@ class RuleEngine:
         priority: Optional[int] = None
     ) -> bool:
         """Update a rule"""
-        updates = []
-        values = []
-        
-        if enabled is not None:
-            updates.append("enabled = ?")
-            values.append(1 if enabled else 0)
-        
-        if parameters is not None:
-            updates.append("parameters = ?")
-            values.append(json.dumps(parameters))
-        
-        if priority is not None:
-            updates.append("priority = ?")
-            values.append(priority)
-        
-        if not updates:
+        if enabled is None and parameters is None and priority is None:
             return False
         
-        updates.append("updated_at = ?")
-        values.append(datetime.utcnow().isoformat())
-        values.append(rule_id)
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            query = f"UPDATE rules SET {', '.join(updates)} WHERE id = ?"
-            cursor.execute(query, values)
+        with self._lock:
+            cursor = self._conn.cursor()
+            # Fixed SQL text so the statement cache is reused; COALESCE keeps
+            # the stored value for any field passed as None
+            cursor.execute(
+                """
+                UPDATE rules
+                SET enabled = COALESCE(?, enabled),
+                    parameters = COALESCE(?, parameters),
+                    priority = COALESCE(?, priority),
+                    updated_at = ?
+                WHERE id = ?
+                """,
+                (
+                    None if enabled is None else (1 if enabled else 0),
+                    None if parameters is None else json.dumps(parameters),
+                    priority,
+                    datetime.utcnow().isoformat(),
+                    rule_id
+                )
+            )
             updated = cursor.rowcount > 0
-            conn.commit()
             
             if updated:
-                logger.info(f"Updated rule ID: {rule_id}")
+                self._invalidate_rules_cache()
+                logger.info("Updated rule ID: %s", rule_id)
             
             return updated
 
@@ -2,14 +2,67 @@
 AI Spending Controls - Phase 6
 Enhanced security controls for AI-initiated transactions
 """
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
-from datetime import datetime, timedelta
+import os
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Tuple
+from datetime import datetime, timedelta, timezone
 import sqlite3
 from enum import Enum
 
+try:
+    import redis
+except ImportError:  # pragma: no cover - optional shared backend
+    redis = None
+
 logger = logging.getLogger(__name__)
 
+# Shared spending window in Redis: a sorted set of "{row id}:{counted amount}"
+# members scored by epoch seconds, mirroring the last 24h of
+# ai_spending_history. Every worker adds its own rows, so the caps hold across
+# processes; the seeded marker is set once the set has been filled from SQLite.
+REDIS_SPEND_KEY = "ai_spend:window"
+REDIS_SEEDED_KEY = "ai_spend:seeded"
+REDIS_WINDOW_SECONDS = 24 * 3600
+# The marker expires so the set is periodically re-filled from SQLite (an
+# idempotent ZADD), repairing any add a worker failed to mirror
+REDIS_RESEED_SECONDS = 300
+
+# Trim entries older than the day window, then return
+# (hourly spend, daily spend, hourly count), or nil if the set is not seeded.
+# Sums are returned as strings since Lua numbers become Redis integers.
+REDIS_WINDOW_STATS_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[2])
+if redis.call('EXISTS', KEYS[2]) == 0 then return false end
+local rows = redis.call('ZRANGEBYSCORE', KEYS[1], '(' .. ARGV[2], '+inf', 'WITHSCORES')
+local hour_cutoff = tonumber(ARGV[1])
+local hour_spent, day_spent, hour_count = 0, 0, 0
+for i = 1, #rows, 2 do
+    local amount = tonumber(string.match(rows[i], ':(.*)$'))
+    day_spent = day_spent + amount
+    if tonumber(rows[i + 1]) > hour_cutoff then
+        hour_spent = hour_spent + amount
+        hour_count = hour_count + 1
+    end
+end
+return {tostring(hour_spent), tostring(day_spent), hour_count}
+"""
+
+# Pending approvals past expires_at are marked expired in batches this often;
+# reads report them as expired in the meantime
+APPROVAL_EXPIRY_SWEEP_SECONDS = 300
+
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
 
 class ApprovalStatus(str, Enum):
     PENDING = "pending"
@@ -18,6 +71,33 @@ class ApprovalStatus(str, Enum):
     EXPIRED = "expired"
 
 
+# Plain-string status values for SQL parameters
+_PENDING = ApprovalStatus.PENDING.value
+_APPROVED = ApprovalStatus.APPROVED.value
+_REJECTED = ApprovalStatus.REJECTED.value
+_EXPIRED = ApprovalStatus.EXPIRED.value
+
+# Hot-path statements kept as fixed text so the connection's statement cache
+# reuses the prepared form; all bind a single integer epoch cutoff
+_SPENDING_SQL = "SELECT SUM(amount) FROM ai_spending_history WHERE ts > ? AND approved = 1"
+_TX_COUNT_SQL = "SELECT COUNT(*) FROM ai_spending_history WHERE ts > ?"
+_WINDOW_STATS_SQL = """
+    SELECT
+        COALESCE(SUM(CASE WHEN ts > ?1 AND approved = 1 THEN amount END), 0.0),
+        COALESCE(SUM(CASE WHEN approved = 1 THEN amount END), 0.0),
+        COALESCE(SUM(CASE WHEN ts > ?1 THEN 1 END), 0)
+    FROM ai_spending_history
+    WHERE ts > ?2
+"""
+
+# approval_requests columns with status resolved against expires_at (bound as ?)
+_APPROVAL_COLUMNS = f"""
+    id, timestamp, expires_at, from_address, to_address, amount, currency, reason,
+    CASE WHEN status = '{_PENDING}' AND expires_at < ? THEN '{_EXPIRED}' ELSE status END AS status,
+    approved_at, approved_by
+"""
+
+
 class AISecurityLevel(str, Enum):
     """Security levels for AI actions"""
     UNRESTRICTED = "unrestricted"  # No limits (dangerous!)
@@ -26,6 +106,17 @@ class AISecurityLevel(str, Enum):
     LOCKDOWN = "lockdown"          # Requires approval for everything
 
 
+@dataclass(frozen=True, slots=True)
+class Thresholds:
+    """Spending limits for one security level"""
+    max_single_tx: float
+    hourly_limit: float
+    daily_limit: float
+    approval_threshold: float
+    max_tx_per_hour: int
+    require_approval: bool
+
+
 class AISpendingController:
     """
     Controls AI spending with multi-layer security:
@@ -36,58 +127,121 @@ class AISpendingController:
     5. Suspicious activity detection
     """
     
-    def __init__(self, db_path: str = "chainpilot.db", security_level: AISecurityLevel = AISecurityLevel.STRICT):
+    def __init__(
+        self,
+        db_path: str = "chainpilot.db",
+        security_level: AISecurityLevel = AISecurityLevel.STRICT,
+        redis_url: Optional[str] = None
+    ):
         self.db_path = db_path
         self.security_level = security_level
         self.conn: Optional[sqlite3.Connection] = None
+        # Serializes use of the shared connection across threads
+        self._lock = threading.RLock()
+        self._expiry_task: Optional[asyncio.Task] = None
+        
+        # Optional shared window counters; without them every check reads
+        # SQLite, which is exact across workers sharing the database file
+        self._redis = None
+        self._window_stats = None
+        redis_url = redis_url or os.getenv("REDIS_URL")
+        if redis_url:
+            if redis is None:
+                logger.warning("REDIS_URL set but redis package not installed, reading spending from SQLite")
+            else:
+                self._redis = redis.Redis.from_url(redis_url)
+                self._window_stats = self._redis.register_script(REDIS_WINDOW_STATS_SCRIPT)
         
         # Security thresholds based on level
         self.thresholds = self._get_thresholds(security_level)
         
         logger.info(f"AI Spending Controller initialized with {security_level.value} security")
     
-    def _get_thresholds(self, level: AISecurityLevel) -> Dict[str, Any]:
+    def _get_thresholds(self, level: AISecurityLevel) -> Thresholds:
         """Get security thresholds based on security level"""
         thresholds = {
-            AISecurityLevel.UNRESTRICTED: {
-                "max_single_tx": float('inf'),
-                "hourly_limit": float('inf'),
-                "daily_limit": float('inf'),
-                "approval_threshold": float('inf'),
-                "max_tx_per_hour": 1000,
-                "require_approval": False
-            },
-            AISecurityLevel.MODERATE: {
-                "max_single_tx": 1.0,  # 1 ETH per transaction
-                "hourly_limit": 5.0,    # 5 ETH per hour
-                "daily_limit": 20.0,    # 20 ETH per day
-                "approval_threshold": 0.5,  # Require approval > 0.5 ETH
-                "max_tx_per_hour": 50,
-                "require_approval": False
-            },
-            AISecurityLevel.STRICT: {
-                "max_single_tx": 0.5,   # 0.5 ETH per transaction
-                "hourly_limit": 2.0,     # 2 ETH per hour
-                "daily_limit": 10.0,     # 10 ETH per day
-                "approval_threshold": 0.1,  # Require approval > 0.1 ETH
-                "max_tx_per_hour": 20,
-                "require_approval": False
-            },
-            AISecurityLevel.LOCKDOWN: {
-                "max_single_tx": 0.1,    # 0.1 ETH per transaction
-                "hourly_limit": 0.5,     # 0.5 ETH per hour
-                "daily_limit": 2.0,      # 2 ETH per day
-                "approval_threshold": 0.01,  # Require approval > 0.01 ETH
-                "max_tx_per_hour": 5,
-                "require_approval": True  # Require approval for ALL transactions
-            }
+            AISecurityLevel.UNRESTRICTED: Thresholds(
+                max_single_tx=float('inf'),
+                hourly_limit=float('inf'),
+                daily_limit=float('inf'),
+                approval_threshold=float('inf'),
+                max_tx_per_hour=1000,
+                require_approval=False
+            ),
+            AISecurityLevel.MODERATE: Thresholds(
+                max_single_tx=1.0,  # 1 ETH per transaction
+                hourly_limit=5.0,    # 5 ETH per hour
+                daily_limit=20.0,    # 20 ETH per day
+                approval_threshold=0.5,  # Require approval > 0.5 ETH
+                max_tx_per_hour=50,
+                require_approval=False
+            ),
+            AISecurityLevel.STRICT: Thresholds(
+                max_single_tx=0.5,   # 0.5 ETH per transaction
+                hourly_limit=2.0,     # 2 ETH per hour
+                daily_limit=10.0,     # 10 ETH per day
+                approval_threshold=0.1,  # Require approval > 0.1 ETH
+                max_tx_per_hour=20,
+                require_approval=False
+            ),
+            AISecurityLevel.LOCKDOWN: Thresholds(
+                max_single_tx=0.1,    # 0.1 ETH per transaction
+                hourly_limit=0.5,     # 0.5 ETH per hour
+                daily_limit=2.0,      # 2 ETH per day
+                approval_threshold=0.01,  # Require approval > 0.01 ETH
+                max_tx_per_hour=5,
+                require_approval=True  # Require approval for ALL transactions
+            )
         }
         return thresholds[level]
     
+    def _get_conn(self) -> sqlite3.Connection:
+        """Get the shared connection, opening it on first use"""
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            for pragma in SQLITE_PRAGMAS:
+                self.conn.execute(pragma)
+        return self.conn
+    
     async def connect(self):
         """Connect to database and create tables"""
-        self.conn = sqlite3.connect(self.db_path)
-        cursor = self.conn.cursor()
+        await asyncio.to_thread(self._initialize)
+        if self._expiry_task is None:
+            self._expiry_task = asyncio.create_task(self._expiry_sweeper())
+        logger.info("AI spending control database initialized")
+    
+    def _initialize(self):
+        """Create tables and expire stale approvals"""
+        with self._lock:
+            self._create_tables()
+            self._expire_requests()
+    
+    async def _expiry_sweeper(self):
+        """Periodically mark stale pending approvals as expired"""
+        while True:
+            await asyncio.sleep(APPROVAL_EXPIRY_SWEEP_SECONDS)
+            try:
+                await asyncio.to_thread(self._expire_requests)
+            except sqlite3.Error as e:
+                logger.error(f"Failed to expire approval requests: {e}")
+    
+    def _expire_requests(self) -> int:
+        """Batch-update pending approvals past expires_at to expired"""
+        with self._lock:
+            conn = self._get_conn()
+            cursor = conn.execute("""
+                UPDATE approval_requests SET status = ?
+                WHERE status = ? AND expires_at < ?
+            """, (_EXPIRED, _PENDING, datetime.utcnow().isoformat()))
+            conn.commit()
+            
+            if cursor.rowcount > 0:
+                logger.info(f"Expired {cursor.rowcount} approval requests")
+            return cursor.rowcount
+    
+    def _create_tables(self):
+        """Create tables and indexes"""
+        cursor = self._get_conn().cursor()
         
         # Create AI spending history table
         cursor.execute("""
@@ -100,10 +254,32 @@ class AISpendingController:
                 currency TEXT NOT NULL,
                 approved BOOLEAN NOT NULL,
                 approval_id TEXT,
-                notes TEXT
+                notes TEXT,
+                ts INTEGER
             )
         """)
         
+        # Epoch-seconds column for range scans; older databases get it added
+        # and backfilled from the ISO timestamp
+        cursor.execute("PRAGMA table_info(ai_spending_history)")
+        if "ts" not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute("ALTER TABLE ai_spending_history ADD COLUMN ts INTEGER")
+        cursor.execute("""
+            UPDATE ai_spending_history
+            SET ts = CAST(strftime('%s', timestamp) AS INTEGER)
+            WHERE ts IS NULL
+        """)
+        
+        # Partial covering index for approved spend sums, plain index for counts
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_spend_ts_ok
+            ON ai_spending_history(ts, amount) WHERE approved = 1
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_spend_ts
+            ON ai_spending_history(ts)
+        """)
+        
         # Create approval requests table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS approval_requests (
@@ -121,14 +297,30 @@ class AISpendingController:
             )
         """)
         
+        # Partial index over pending requests only, ordered for the dashboard
+        # listing; historical approved/rejected rows never enter it
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_approval_pending
+            ON approval_requests(timestamp DESC) WHERE status = 'pending'
+        """)
+        
         self.conn.commit()
-        logger.info("AI spending control database initialized")
     
     async def disconnect(self):
         """Disconnect from database"""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
+        if self._expiry_task:
+            self._expiry_task.cancel()
+            self._expiry_task = None
+        await asyncio.to_thread(self._close)
+    
+    def _close(self):
+        """Close the shared connection"""
+        with self._lock:
+            if self.conn:
+                # Refresh planner statistics for tables whose indexes saw use
+                self.conn.execute("PRAGMA optimize")
+                self.conn.close()
+                self.conn = None
     
     async def check_ai_transaction(
         self,
@@ -148,67 +340,72 @@ class AISpendingController:
                 - approval_id: Optional[str]
                 - limits_info: Dict
         """
-        # Get spending history
-        hourly_spent = await self._get_spending(hours=1)
-        daily_spent = await self._get_spending(hours=24)
-        hourly_tx_count = await self._get_transaction_count(hours=1)
-        
+        # Spending fields stay None when the single-transaction check rejects
+        # before history is read
         limits_info = {
-            "hourly_spent": hourly_spent,
-            "daily_spent": daily_spent,
-            "hourly_limit": self.thresholds["hourly_limit"],
-            "daily_limit": self.thresholds["daily_limit"],
-            "hourly_tx_count": hourly_tx_count,
-            "max_tx_per_hour": self.thresholds["max_tx_per_hour"],
+            "hourly_spent": None,
+            "daily_spent": None,
+            "hourly_limit": self.thresholds.hourly_limit,
+            "daily_limit": self.thresholds.daily_limit,
+            "hourly_tx_count": None,
+            "max_tx_per_hour": self.thresholds.max_tx_per_hour,
             "security_level": self.security_level.value
         }
         
-        # Check 1: Single transaction limit
-        if amount > self.thresholds["max_single_tx"]:
+        # Check 1: Single transaction limit (needs no spending history)
+        if amount > self.thresholds.max_single_tx:
             return {
                 "allowed": False,
-                "reason": f"Transaction amount ({amount} {currency}) exceeds single transaction limit ({self.thresholds['max_single_tx']} {currency})",
+                "reason": f"Transaction amount ({amount} {currency}) exceeds single transaction limit ({self.thresholds.max_single_tx} {currency})",
                 "requires_approval": True,
                 "approval_id": await self._create_approval_request(from_address, to_address, amount, currency, "exceeds_single_tx_limit"),
                 "limits_info": limits_info
             }
         
+        # Get spending history
+        hourly_spent, daily_spent, hourly_tx_count = await self._get_window_stats()
+        limits_info.update({
+            "hourly_spent": hourly_spent,
+            "daily_spent": daily_spent,
+            "hourly_tx_count": hourly_tx_count
+        })
+        
         # Check 2: Hourly spending limit
-        if hourly_spent + amount > self.thresholds["hourly_limit"]:
+        if hourly_spent + amount > self.thresholds.hourly_limit:
             return {
                 "allowed": False,
-                "reason": f"Would exceed hourly spending limit ({hourly_spent + amount:.4f} > {self.thresholds['hourly_limit']} {currency})",
+                "reason": f"Would exceed hourly spending limit ({hourly_spent + amount:.4f} > {self.thresholds.hourly_limit} {currency})",
                 "requires_approval": True,
                 "approval_id": await self._create_approval_request(from_address, to_address, amount, currency, "exceeds_hourly_limit"),
                 "limits_info": limits_info
             }
         
         # Check 3: Daily spending limit
-        if daily_spent + amount > self.thresholds["daily_limit"]:
+        if daily_spent + amount > self.thresholds.daily_limit:
             return {
                 "allowed": False,
-                "reason": f"Would exceed daily spending limit ({daily_spent + amount:.4f} > {self.thresholds['daily_limit']} {currency})",
+                "reason": f"Would exceed daily spending limit ({daily_spent + amount:.4f} > {self.thresholds.daily_limit} {currency})",
                 "requires_approval": True,
                 "approval_id": await self._create_approval_request(from_address, to_address, amount, currency, "exceeds_daily_limit"),
                 "limits_info": limits_info
             }
         
         # Check 4: Transaction frequency
-        if hourly_tx_count >= self.thresholds["max_tx_per_hour"]:
+        if hourly_tx_count >= self.thresholds.max_tx_per_hour:
             return {
                 "allowed": False,
-                "reason": f"Too many transactions per hour ({hourly_tx_count} >= {self.thresholds['max_tx_per_hour']})",
+                "reason": f"Too many transactions per hour ({hourly_tx_count} >= {self.thresholds.max_tx_per_hour})",
                 "requires_approval": True,
                 "approval_id": await self._create_approval_request(from_address, to_address, amount, currency, "too_frequent"),
                 "limits_info": limits_info
             }
         
         # Check 5: Approval threshold or lockdown mode
-        if amount > self.thresholds["approval_threshold"] or self.thresholds["require_approval"]:
+        if amount > self.thresholds.approval_threshold or self.thresholds.require_approval:
             approval_id = await self._create_approval_request(from_address, to_address, amount, currency, "requires_approval")
             return {
                 "allowed": False,
-                "reason": f"Transaction requires human approval (amount > {self.thresholds['approval_threshold']} {currency} or lockdown mode)",
+                "reason": f"Transaction requires human approval (amount > {self.thresholds.approval_threshold} {currency} or lockdown mode)",
                 "requires_approval": True,
                 "approval_id": approval_id,
                 "limits_info": limits_info
@@ -223,30 +420,82 @@ class AISpendingController:
             "limits_info": limits_info
         }
     
+    def _seed_redis_window(self):
+        """Fill the shared Redis window from the last 24h of spending history"""
+        cutoff = int(time.time()) - REDIS_WINDOW_SECONDS
+        with self._lock:
+            rows = self._get_conn().execute("""
+                SELECT id, ts, amount, approved FROM ai_spending_history
+                WHERE ts > ?
+            """, (cutoff,)).fetchall()
+        
+        # Members are keyed by row id, so rows other workers add concurrently
+        # are never duplicated or lost
+        pipe = self._redis.pipeline()
+        if rows:
+            pipe.zadd(REDIS_SPEND_KEY, {
+                f"{row_id}:{amount if approved else 0.0}": ts
+                for row_id, ts, amount, approved in rows
+            })
+        pipe.set(REDIS_SEEDED_KEY, 1, ex=REDIS_RESEED_SECONDS)
+        pipe.execute()
+        logger.info(f"Seeded shared AI spending window with {len(rows)} transactions")
+    
+    def _redis_window_stats(self, hour_cutoff: int, day_cutoff: int) -> Optional[Tuple[float, float, int]]:
+        """Window stats from the shared Redis window, or None to read SQLite"""
+        try:
+            stats = self._window_stats(keys=[REDIS_SPEND_KEY, REDIS_SEEDED_KEY], args=[hour_cutoff, day_cutoff])
+            if stats is None:
+                self._seed_redis_window()
+                stats = self._window_stats(keys=[REDIS_SPEND_KEY, REDIS_SEEDED_KEY], args=[hour_cutoff, day_cutoff])
+            if stats is None:
+                return None
+            return float(stats[0]), float(stats[1]), int(stats[2])
+        except redis.RedisError as e:
+            logger.warning(f"Redis spending window unavailable, reading SQLite: {e}")
+            return None
+    
+    async def _get_window_stats(self) -> Tuple[float, float, int]:
+        """Get (hourly spend, daily spend, hourly tx count) for a transaction check"""
+        return await asyncio.to_thread(self._sync_get_window_stats)
+    
+    def _sync_get_window_stats(self) -> Tuple[float, float, int]:
+        """Blocking body of _get_window_stats"""
+        now = int(time.time())
+        hour_cutoff = now - 3600
+        day_cutoff = now - 24 * 3600
+        
+        if self._redis is not None:
+            stats = self._redis_window_stats(hour_cutoff, day_cutoff)
+            if stats is not None:
+                return stats
+        
+        # One pass over the 24-hour slice; the hourly figures are a subset
+        with self._lock:
+            return self._get_conn().execute(_WINDOW_STATS_SQL, (hour_cutoff, day_cutoff)).fetchone()
+    
     async def _get_spending(self, hours: int) -> float:
         """Get total spending in last N hours"""
-        cutoff = (datetime.utcnow() - timedelta(hours=hours)).isoformat()
+        return await asyncio.to_thread(self._sync_get_spending, hours)
+    
+    def _sync_get_spending(self, hours: int) -> float:
+        """Blocking body of _get_spending"""
+        cutoff = int(time.time()) - hours * 3600
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT SUM(amount) FROM ai_spending_history
-                WHERE timestamp > ? AND approved = 1
-            """, (cutoff,))
-            result = cursor.fetchone()[0]
+        with self._lock:
+            result = self._get_conn().execute(_SPENDING_SQL, (cutoff,)).fetchone()[0]
             return result if result else 0.0
     
     async def _get_transaction_count(self, hours: int) -> int:
         """Get transaction count in last N hours"""
-        cutoff = (datetime.utcnow() - timedelta(hours=hours)).isoformat()
+        return await asyncio.to_thread(self._sync_get_transaction_count, hours)
+    
+    def _sync_get_transaction_count(self, hours: int) -> int:
+        """Blocking body of _get_transaction_count"""
+        cutoff = int(time.time()) - hours * 3600
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT COUNT(*) FROM ai_spending_history
-                WHERE timestamp > ?
-            """, (cutoff,))
-            return cursor.fetchone()[0]
+        with self._lock:
+            return self._get_conn().execute(_TX_COUNT_SQL, (cutoff,)).fetchone()[0]
     
     async def _create_approval_request(
         self,
@@ -257,19 +506,31 @@ class AISpendingController:
         reason: str
     ) -> str:
         """Create an approval request"""
-        import uuid
-        
-        approval_id = str(uuid.uuid4())
+        return await asyncio.to_thread(
+            self._sync_create_approval_request, from_address, to_address, amount, currency, reason
+        )
+    
+    def _sync_create_approval_request(
+        self,
+        from_address: str,
+        to_address: str,
+        amount: float,
+        currency: str,
+        reason: str
+    ) -> str:
+        """Blocking body of _create_approval_request"""
+        approval_id = secrets.token_hex(16)
         timestamp = datetime.utcnow().isoformat()
         expires_at = (datetime.utcnow() + timedelta(hours=24)).isoformat()
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock:
+            conn = self._get_conn()
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO approval_requests 
                 (id, timestamp, expires_at, from_address, to_address, amount, currency, reason, status)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (approval_id, timestamp, expires_at, from_address, to_address, amount, currency, reason, ApprovalStatus.PENDING.value))
+            """, (approval_id, timestamp, expires_at, from_address, to_address, amount, currency, reason, _PENDING))
             conn.commit()
         
         logger.info(f"Created approval request {approval_id} for {amount} {currency}")
@@ -286,74 +547,141 @@ class AISpendingController:
         notes: Optional[str] = None
     ):
         """Record a transaction in AI spending history"""
-        timestamp = datetime.utcnow().isoformat()
+        await asyncio.to_thread(
+            self._sync_record_transaction,
+            from_address, to_address, amount, currency, approved, approval_id, notes
+        )
         
-        with sqlite3.connect(self.db_path) as conn:
+        logger.info(f"Recorded AI transaction: {amount} {currency} from {from_address[:10]}... to {to_address[:10]}...")
+    
+    def _sync_record_transaction(
+        self,
+        from_address: str,
+        to_address: str,
+        amount: float,
+        currency: str,
+        approved: bool,
+        approval_id: Optional[str],
+        notes: Optional[str]
+    ):
+        """Blocking body of record_transaction"""
+        now = time.time()
+        timestamp = datetime.fromtimestamp(now, timezone.utc).replace(tzinfo=None).isoformat()
+        
+        with self._lock:
+            conn = self._get_conn()
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO ai_spending_history
-                (timestamp, from_address, to_address, amount, currency, approved, approval_id, notes)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (timestamp, from_address, to_address, amount, currency, approved, approval_id, notes))
+                (timestamp, from_address, to_address, amount, currency, approved, approval_id, notes, ts)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (timestamp, from_address, to_address, amount, currency, approved, approval_id, notes, int(now)))
             conn.commit()
+            row_id = cursor.lastrowid
         
-        logger.info(f"Recorded AI transaction: {amount} {currency} from {from_address[:10]}... to {to_address[:10]}...")
+        if self._redis is not None:
+            try:
+                self._redis.zadd(REDIS_SPEND_KEY, {f"{row_id}:{amount if approved else 0.0}": int(now)})
+            except redis.RedisError as e:
+                # Force a reseed from SQLite so the shared window never undercounts
+                logger.warning(f"Failed to add AI spend to Redis window: {e}")
+                try:
+                    self._redis.delete(REDIS_SEEDED_KEY)
+                except redis.RedisError:
+                    pass
     
     async def get_approval_requests(self, status: Optional[ApprovalStatus] = None) -> List[Dict[str, Any]]:
         """Get approval requests"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+        return await asyncio.to_thread(self._sync_get_approval_requests, status)
+    
+    def _sync_get_approval_requests(self, status: Optional[ApprovalStatus]) -> List[Dict[str, Any]]:
+        """Blocking body of get_approval_requests"""
+        with self._lock:
+            cursor = self._get_conn().cursor()
+            now = datetime.utcnow().isoformat()
             
-            if status:
-                cursor.execute("SELECT * FROM approval_requests WHERE status = ? ORDER BY timestamp DESC", (status.value,))
+            if status == ApprovalStatus.PENDING:
+                # Literal status so the planner can use idx_approval_pending
+                cursor.execute(f"""
+                    SELECT {_APPROVAL_COLUMNS} FROM approval_requests
+                    WHERE status = 'pending' AND expires_at >= ? ORDER BY timestamp DESC
+                """, (now, now))
+            elif status == ApprovalStatus.EXPIRED:
+                # Includes pending rows the sweeper has not reached yet
+                cursor.execute(f"""
+                    SELECT {_APPROVAL_COLUMNS} FROM approval_requests
+                    WHERE status = ? OR (status = ? AND expires_at < ?) ORDER BY timestamp DESC
+                """, (now, _EXPIRED, _PENDING, now))
+            elif status:
+                cursor.execute(f"""
+                    SELECT {_APPROVAL_COLUMNS} FROM approval_requests
+                    WHERE status = ? ORDER BY timestamp DESC
+                """, (now, status.value))
             else:
-                cursor.execute("SELECT * FROM approval_requests ORDER BY timestamp DESC")
+                cursor.execute(f"""
+                    SELECT {_APPROVAL_COLUMNS} FROM approval_requests ORDER BY timestamp DESC
+                """, (now,))
             
-            return [dict(row) for row in cursor.fetchall()]
+            # Resolve column names once rather than per row
+            columns = [col[0] for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
     
     async def approve_request(self, approval_id: str, approved_by: str = "admin") -> bool:
         """Approve a pending request"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE approval_requests
-                SET status = ?, approved_at = ?, approved_by = ?
-                WHERE id = ? AND status = ?
-            """, (ApprovalStatus.APPROVED.value, datetime.utcnow().isoformat(), approved_by, approval_id, ApprovalStatus.PENDING.value))
-            conn.commit()
-            
-            if cursor.rowcount > 0:
-                logger.info(f"Approved request {approval_id} by {approved_by}")
-                return True
-            return False
+        approved = await asyncio.to_thread(
+            self._set_request_status, approval_id, _APPROVED, approved_by
+        )
+        if approved:
+            logger.info(f"Approved request {approval_id} by {approved_by}")
+        return approved
     
     async def reject_request(self, approval_id: str, approved_by: str = "admin") -> bool:
         """Reject a pending request"""
-        with sqlite3.connect(self.db_path) as conn:
+        rejected = await asyncio.to_thread(
+            self._set_request_status, approval_id, _REJECTED, approved_by
+        )
+        if rejected:
+            logger.info(f"Rejected request {approval_id} by {approved_by}")
+        return rejected
+    
+    def _set_request_status(self, approval_id: str, status: str, approved_by: str) -> bool:
+        """Move a pending, unexpired request to a final status"""
+        now = datetime.utcnow().isoformat()
+        with self._lock:
+            conn = self._get_conn()
             cursor = conn.cursor()
             cursor.execute("""
                 UPDATE approval_requests
                 SET status = ?, approved_at = ?, approved_by = ?
-                WHERE id = ? AND status = ?
-            """, (ApprovalStatus.REJECTED.value, datetime.utcnow().isoformat(), approved_by, approval_id, ApprovalStatus.PENDING.value))
+                WHERE id = ? AND status = ? AND expires_at >= ?
+            """, (status, now, approved_by, approval_id, _PENDING, now))
             conn.commit()
             
-            if cursor.rowcount > 0:
-                logger.info(f"Rejected request {approval_id} by {approved_by}")
-                return True
-            return False
+            return cursor.rowcount > 0
     
     async def get_spending_summary(self) -> Dict[str, Any]:
         """Get spending summary"""
+        (
+            last_hour,
+            last_24_hours,
+            last_7_days,
+            transactions_last_hour,
+            transactions_last_24_hours
+        ) = await asyncio.gather(
+            self._get_spending(hours=1),
+            self._get_spending(hours=24),
+            self._get_spending(hours=24*7),
+            self._get_transaction_count(hours=1),
+            self._get_transaction_count(hours=24)
+        )
+        
         return {
-            "last_hour": await self._get_spending(hours=1),
-            "last_24_hours": await self._get_spending(hours=24),
-            "last_7_days": await self._get_spending(hours=24*7),
-            "hourly_limit": self.thresholds["hourly_limit"],
-            "daily_limit": self.thresholds["daily_limit"],
+            "last_hour": last_hour,
+            "last_24_hours": last_24_hours,
+            "last_7_days": last_7_days,
+            "hourly_limit": self.thresholds.hourly_limit,
+            "daily_limit": self.thresholds.daily_limit,
             "security_level": self.security_level.value,
-            "transactions_last_hour": await self._get_transaction_count(hours=1),
-            "transactions_last_24_hours": await self._get_transaction_count(hours=24)
+            "transactions_last_hour": transactions_last_hour,
+            "transactions_last_24_hours": transactions_last_24_hours
         }
-
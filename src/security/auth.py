@@ -2,15 +2,39 @@
 API Authentication - Phase 6
 Simple API key authentication for production
 """
+import asyncio
 import secrets
 import hashlib
 from typing import Optional, Dict
 import sqlite3
 import logging
+import threading
+import time
+from collections import OrderedDict, deque
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Validated keys are served from memory for this long before rechecking the DB.
+# Revocation only clears this process's cache, so the TTL bounds how long other
+# workers keep accepting a revoked key.
+KEY_CACHE_SIZE = 10_000
+KEY_CACHE_TTL_SECONDS = 5
+# last_used is written back in batches at most this often
+LAST_USED_FLUSH_SECONDS = 5
+# api_usage rows are buffered and inserted every interval or once this many queue up
+USAGE_FLUSH_INTERVAL_SECONDS = 0.5
+USAGE_FLUSH_ROWS = 1000
+# "cp_" + secrets.token_urlsafe(32)
+API_KEY_LENGTH = 46
+
 
 class APIKeyAuth:
     """
@@ -23,12 +47,41 @@ class APIKeyAuth:
     def __init__(self, db_path: str = "chainpilot.db"):
         self.db_path = db_path
         self.conn: Optional[sqlite3.Connection] = None
+        # Serializes use of the shared connection across threads
+        self._lock = threading.RLock()
+        # {key_hash: (key_prefix, expires_at)} for active keys, least recently used first
+        self._key_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        # {key_hash: last_used} awaiting write-back
+        self._pending_last_used: Dict[str, str] = {}
+        self._last_used_flushed_at = time.monotonic()
+        # (key_prefix, endpoint, timestamp, ip_address) rows awaiting insert
+        self._usage_q: deque = deque()
+        self._flush_task: Optional[asyncio.Task] = None
         logger.info("API Key Auth initialized")
     
+    def _get_conn(self) -> sqlite3.Connection:
+        """Get the shared connection, opening it on first use"""
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            for pragma in SQLITE_PRAGMAS:
+                self.conn.execute(pragma)
+        return self.conn
+    
     async def connect(self):
         """Initialize database"""
-        self.conn = sqlite3.connect(self.db_path)
-        cursor = self.conn.cursor()
+        await asyncio.to_thread(self._initialize)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flusher())
+        logger.info("API Key Auth database initialized")
+    
+    def _initialize(self):
+        """Create tables on the shared connection"""
+        with self._lock:
+            self._create_tables()
+    
+    def _create_tables(self):
+        """Create API key tables"""
+        cursor = self._get_conn().cursor()
         
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS api_keys (
@@ -53,14 +106,34 @@ class APIKeyAuth:
             )
         """)
         
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_api_keys_prefix ON api_keys(key_prefix)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_api_usage_prefix_ts ON api_usage(key_prefix, timestamp)")
+        
         self.conn.commit()
-        logger.info("API Key Auth database initialized")
+    
+    async def _flusher(self):
+        """Periodically write buffered usage rows"""
+        while True:
+            await asyncio.sleep(USAGE_FLUSH_INTERVAL_SECONDS)
+            if self._usage_q:
+                try:
+                    await asyncio.to_thread(self._flush_usage)
+                except sqlite3.Error as e:
+                    logger.error(f"Failed to flush API usage: {e}")
     
     async def disconnect(self):
         """Close database connection"""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        
+        with self._lock:
+            while self._usage_q:
+                self._flush_usage()
+            if self.conn:
+                self._flush_last_used()
+                self.conn.close()
+                self.conn = None
     
     def generate_api_key(self, name: str) -> str:
         """
@@ -78,7 +151,8 @@ class APIKeyAuth:
         
         timestamp = datetime.utcnow().isoformat()
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock:
+            conn = self._get_conn()
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO api_keys (key_hash, key_prefix, name, created_at)
@@ -96,65 +170,112 @@ class APIKeyAuth:
         Returns:
             True if valid and active
         """
-        if not api_key or not api_key.startswith("cp_"):
+        # Reject malformed (including oversized) input before hashing it
+        if not api_key or len(api_key) != API_KEY_LENGTH or not api_key.startswith("cp_"):
             return False
         
         # Hash the provided key
         key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+        now = time.monotonic()
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM api_keys WHERE key_hash = ? AND is_active = 1
-            """, (key_hash,))
-            
-            result = cursor.fetchone()
-            
-            if result:
-                # Update last used
+        with self._lock:
+            cached = self._key_cache.get(key_hash)
+            if cached is not None and cached[1] > now:
+                self._key_cache.move_to_end(key_hash)
+                key_prefix = cached[0]
+            else:
+                conn = self._get_conn()
+                cursor = conn.cursor()
                 cursor.execute("""
-                    UPDATE api_keys SET last_used = ? WHERE key_hash = ?
-                """, (datetime.utcnow().isoformat(), key_hash))
-                conn.commit()
+                    SELECT key_prefix FROM api_keys WHERE key_hash = ? AND is_active = 1
+                """, (key_hash,))
+                result = cursor.fetchone()
                 
-                logger.debug(f"Valid API key: {result['key_prefix']}")
-                return True
+                if not result:
+                    self._key_cache.pop(key_hash, None)
+                    logger.warning(f"Invalid API key attempted")
+                    return False
+                
+                key_prefix = result[0]
+                self._key_cache[key_hash] = (key_prefix, now + KEY_CACHE_TTL_SECONDS)
+                self._key_cache.move_to_end(key_hash)
+                if len(self._key_cache) > KEY_CACHE_SIZE:
+                    self._key_cache.popitem(last=False)
+            
+            # Defer the last_used write; flushed in batches
+            self._pending_last_used[key_hash] = datetime.utcnow().isoformat()
+            if now - self._last_used_flushed_at >= LAST_USED_FLUSH_SECONDS:
+                self._flush_last_used()
         
-        logger.warning(f"Invalid API key attempted")
-        return False
+        logger.debug(f"Valid API key: {key_prefix}")
+        return True
     
+    def _flush_last_used(self):
+        """Write pending last_used timestamps in one transaction (caller holds the lock)"""
+        self._last_used_flushed_at = time.monotonic()
+        if not self._pending_last_used:
+            return
+        
+        pending = [(ts, key_hash) for key_hash, ts in self._pending_last_used.items()]
+        self._pending_last_used.clear()
+        conn = self._get_conn()
+        conn.executemany("""
+            UPDATE api_keys SET last_used = ? WHERE key_hash = ?
+        """, pending)
+        conn.commit()
+        
     def record_usage(self, api_key: str, endpoint: str, ip_address: str):
         """Record API usage"""
         if api_key.startswith("cp_"):
             key_prefix = api_key[:10]
             timestamp = datetime.utcnow().isoformat()
             
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO api_usage (key_prefix, endpoint, timestamp, ip_address)
-                    VALUES (?, ?, ?, ?)
-                """, (key_prefix, endpoint, timestamp, ip_address))
-                conn.commit()
+            # Buffered; written in batches by the flusher (deque.append is thread-safe)
+            self._usage_q.append((key_prefix, endpoint, timestamp, ip_address))
+            if len(self._usage_q) >= USAGE_FLUSH_ROWS:
+                self._flush_usage()
+    
+    def _flush_usage(self):
+        """Insert buffered usage rows in one transaction"""
+        with self._lock:
+            batch = []
+            while self._usage_q and len(batch) < USAGE_FLUSH_ROWS:
+                batch.append(self._usage_q.popleft())
+            if not batch:
+                return
+            
+            conn = self._get_conn()
+            conn.executemany("""
+                INSERT INTO api_usage (key_prefix, endpoint, timestamp, ip_address)
+                VALUES (?, ?, ?, ?)
+            """, batch)
+            conn.commit()
     
     def list_api_keys(self) -> list:
         """List all API keys (without revealing the actual keys)"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._flush_last_used()
+            conn = self._get_conn()
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             cursor.execute("SELECT key_prefix, name, created_at, last_used, is_active FROM api_keys ORDER BY created_at DESC")
             return [dict(row) for row in cursor.fetchall()]
     
     def revoke_api_key(self, key_prefix: str) -> bool:
         """Revoke an API key"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock:
+            conn = self._get_conn()
             cursor = conn.cursor()
             cursor.execute("""
                 UPDATE api_keys SET is_active = 0 WHERE key_prefix = ?
             """, (key_prefix,))
             conn.commit()
             
+            # Drop this process's cached validations; other workers expire
+            # theirs within KEY_CACHE_TTL_SECONDS
+            for key_hash in [h for h, (prefix, _) in self._key_cache.items() if prefix == key_prefix]:
+                del self._key_cache[key_hash]
+            
             if cursor.rowcount > 0:
                 logger.info(f"Revoked API key: {key_prefix}")
                 return True
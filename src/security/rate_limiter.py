@@ -2,25 +2,47 @@
 Rate Limiting - Phase 6
 Protect API from abuse and DoS attacks
 """
+import os
 import time
-from collections import defaultdict
-from typing import Dict, Tuple
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 import logging
 
+try:
+    import redis
+except ImportError:  # pragma: no cover - optional shared backend
+    redis = None
+
 logger = logging.getLogger(__name__)
 
+# In-memory bucket bounds: LRU cap plus idle sweep every N checks
+MAX_BUCKETS = 100_000
+BUCKET_IDLE_SECONDS = 120
+SWEEP_EVERY_CALLS = 10_000
+
+# Fixed-window counter: INCR the per-minute key and arm its TTL on first hit,
+# atomically, so every worker sharing the Redis instance sees one limit.
+REDIS_WINDOW_SECONDS = 60
+REDIS_INCR_SCRIPT = """
+local c = redis.call('INCR', KEYS[1])
+if c == 1 then redis.call('EXPIRE', KEYS[1], ARGV[1]) end
+return c
+"""
+
 
 class RateLimiter:
     """
     Token bucket rate limiter
     - Prevents API abuse
-    - Configurable limits per endpoint
+    - Configurable limits per endpoint (fixed when the limiter is created)
     - Per-IP tracking
+    - Shared across workers via Redis when REDIS_URL is set
     """
     
-    def __init__(self):
-        # Storage: {ip: {endpoint: (tokens, last_update)}}
-        self.buckets: Dict[str, Dict[str, Tuple[float, float]]] = defaultdict(dict)
+    def __init__(self, redis_url: Optional[str] = None):
+        # Storage: {(ip, endpoint): [tokens, last_update]}, least recently used first
+        self.buckets: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+        self._calls = 0
         
         # Rate limits: requests per minute
         self.limits = {
@@ -31,7 +53,25 @@ class RateLimiter:
             "/api/v1/ai/parse": 30,          # 30 req/min for AI parsing
         }
         
-        logger.info("Rate limiter initialized")
+        # (limit, refill tokens/second) per endpoint, snapshotted here: limits
+        # are frozen at construction and later edits to self.limits are ignored
+        self._rates = {ep: (lim, lim / 60.0) for ep, lim in self.limits.items()}
+        self._default_rate = self._rates["default"]
+        # Bound once: exact-match lookup is one hash probe, no automaton needed at this table size
+        self._get_rate = self._rates.get
+        
+        # Optional shared backend: counters keyed rl:{ip}:{endpoint}:{minute}
+        self._redis = None
+        self._incr = None
+        redis_url = redis_url or os.getenv("REDIS_URL")
+        if redis_url:
+            if redis is None:
+                logger.warning("REDIS_URL set but redis package not installed, using in-memory buckets")
+            else:
+                self._redis = redis.Redis.from_url(redis_url)
+                self._incr = self._redis.register_script(REDIS_INCR_SCRIPT)
+        
+        logger.info(f"Rate limiter initialized ({'redis' if self._redis else 'memory'} backend)")
     
     def is_allowed(self, ip: str, endpoint: str) -> Tuple[bool, Dict[str, any]]:
         """
@@ -40,25 +80,42 @@ class RateLimiter:
         Returns:
             Tuple of (allowed: bool, info: dict)
         """
-        # Get rate limit for this endpoint
-        limit = self.limits.get(endpoint, self.limits["default"])
+        # Get rate limit and refill rate for this endpoint
+        limit, refill = self._get_rate(endpoint, self._default_rate)
         
-        # Get or create bucket
-        if endpoint not in self.buckets[ip]:
-            self.buckets[ip][endpoint] = (limit, time.time())
+        if self._redis is not None:
+            try:
+                return self._is_allowed_redis(ip, endpoint, limit)
+            except redis.RedisError as e:
+                logger.warning(f"Redis rate limit check failed, using in-memory buckets: {e}")
         
-        tokens, last_update = self.buckets[ip][endpoint]
-        now = time.time()
+        # Monotonic clock: cheaper and immune to wall-clock jumps
+        now = time.monotonic()
+        self._calls += 1
+        if self._calls >= SWEEP_EVERY_CALLS:
+            self._sweep(now)
         
-        # Refill tokens based on time passed
-        time_passed = now - last_update
-        tokens = min(limit, tokens + (time_passed * limit / 60.0))  # Refill rate: limit per minute
+        # Get or create bucket, bumping it to most recently used
+        key = (ip, endpoint)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            if len(self.buckets) >= MAX_BUCKETS:
+                self.buckets.popitem(last=False)
+            bucket = self.buckets[key] = [limit, now]
+            tokens = limit
+        else:
+            self.buckets.move_to_end(key)
+            # Refill tokens based on time passed
+            tokens = bucket[0] + (now - bucket[1]) * refill
+            if tokens > limit:
+                tokens = limit
         
         # Check if we have tokens
         if tokens >= 1.0:
-            # Consume one token
+            # Consume one token, updating the bucket in place
             tokens -= 1.0
-            self.buckets[ip][endpoint] = (tokens, now)
+            bucket[0] = tokens
+            bucket[1] = now
             
             return True, {
                 "allowed": True,
@@ -76,18 +133,72 @@ class RateLimiter:
                 "retry_after": int((1.0 - tokens) * 60 / limit)
             }
     
+    def _is_allowed_redis(self, ip: str, endpoint: str, limit: int) -> Tuple[bool, Dict[str, any]]:
+        """
+        Fixed-window check against the shared Redis counter
+        
+        Args:
+            ip: Client IP
+            endpoint: Request path
+            limit: Requests allowed per window
+            
+        Returns:
+            Tuple of (allowed: bool, info: dict)
+        """
+        now = time.time()
+        window = int(now // REDIS_WINDOW_SECONDS)
+        reset_in = int(REDIS_WINDOW_SECONDS - (now % REDIS_WINDOW_SECONDS))
+        count = int(self._incr(keys=[f"rl:{ip}:{endpoint}:{window}"], args=[REDIS_WINDOW_SECONDS]))
+        
+        if count <= limit:
+            return True, {
+                "allowed": True,
+                "remaining": limit - count,
+                "limit": limit,
+                "reset_in": reset_in
+            }
+        return False, {
+            "allowed": False,
+            "remaining": 0,
+            "limit": limit,
+            "reset_in": reset_in,
+            "retry_after": reset_in
+        }
+    
+    def _sweep(self, now: float):
+        """Drop buckets idle longer than BUCKET_IDLE_SECONDS (they would be full again)"""
+        self._calls = 0
+        cutoff = now - BUCKET_IDLE_SECONDS
+        stale = [key for key, bucket in self.buckets.items() if bucket[1] < cutoff]
+        for key in stale:
+            del self.buckets[key]
+        if stale:
+            logger.debug(f"Swept {len(stale)} idle rate limit buckets")
+    
     def reset_ip(self, ip: str):
         """Reset rate limits for an IP"""
-        if ip in self.buckets:
-            del self.buckets[ip]
+        if self._redis is not None:
+            try:
+                keys = list(self._redis.scan_iter(match=f"rl:{ip}:*"))
+                if keys:
+                    self._redis.delete(*keys)
+            except redis.RedisError as e:
+                logger.warning(f"Failed to reset Redis rate limits for {ip}: {e}")
+        
+        keys = [key for key in self.buckets if key[0] == ip]
+        for key in keys:
+            del self.buckets[key]
+        if keys:
             logger.info(f"Reset rate limits for IP: {ip}")
     
     def get_stats(self) -> Dict[str, any]:
         """Get rate limiter statistics"""
         return {
-            "tracked_ips": len(self.buckets),
+            "backend": "redis" if self._redis is not None else "memory",
+            "tracked_ips": len({ip for ip, _ in self.buckets}),
             "limits": self.limits,
-            "total_buckets": sum(len(endpoints) for endpoints in self.buckets.values())
+            "total_buckets": len(self.buckets),
+            "max_buckets": MAX_BUCKETS
         }
 
 
@@ -4,7 +4,7 @@ Tests for core wallet and balance functionality
 """
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 import os
 
 # Set test environment variables before importing app
@@ -43,12 +43,16 @@ class TestAPIEndpoints:
         """Mock WalletManager"""
         mock = Mock()
         mock.web3_manager = mock_web3_manager
-        mock.create_wallet.return_value = {
+        wallet_info = {
             "wallet_name": "test_wallet",
             "address": "0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb7",
             "wallet_path": "./test_wallets/test_wallet.json",
             "network": "sepolia"
         }
+        # Routes await the async wrappers, which run the KDF off the event loop
+        mock.acreate_wallet = AsyncMock(return_value=wallet_info)
+        mock.aimport_wallet = AsyncMock(return_value=wallet_info)
+        mock.aload_wallet = AsyncMock(return_value=wallet_info)
         mock.get_current_wallet.return_value = "0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb7"
         mock.get_balance.return_value = {
             "address": "0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb7",
@@ -117,12 +121,16 @@ class TestWalletEndpoints:
         """Mock WalletManager"""
         mock = Mock()
         mock.web3_manager = mock_web3_manager
-        mock.create_wallet.return_value = {
+        wallet_info = {
             "wallet_name": "test_wallet",
             "address": "0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb7",
             "wallet_path": "./test_wallets/test_wallet.json",
             "network": "sepolia"
         }
+        # Routes await the async wrappers, which run the KDF off the event loop
+        mock.acreate_wallet = AsyncMock(return_value=wallet_info)
+        mock.aimport_wallet = AsyncMock(return_value=wallet_info)
+        mock.aload_wallet = AsyncMock(return_value=wallet_info)
         mock.get_current_wallet.return_value = "0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb7"
         mock.get_balance.return_value = {
             "address": "0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb7",
@@ -153,6 +161,33 @@ class TestWalletEndpoints:
         assert data["wallet_name"] == "test_wallet"
         assert "address" in data
         assert data["network"] == "sepolia"
+        client.app.state.wallet_manager.acreate_wallet.assert_awaited_once_with("test_wallet")
+    
+    def test_import_wallet(self, client):
+        """Test wallet import"""
+        response = client.post(
+            "/api/v1/wallet/import",
+            json={"wallet_name": "test_wallet", "private_key": "0x" + "11" * 32}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["wallet_name"] == "test_wallet"
+        client.app.state.wallet_manager.aimport_wallet.assert_awaited_once_with(
+            "test_wallet", "0x" + "11" * 32
+        )
+    
+    def test_load_wallet(self, client):
+        """Test wallet loading"""
+        response = client.post(
+            "/api/v1/wallet/load",
+            json={"wallet_name": "test_wallet"}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["address"] == "0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb7"
+        client.app.state.wallet_manager.aload_wallet.assert_awaited_once_with("test_wallet")
     
     def test_list_wallets(self, client):
         """Test listing wallets"""
@@ -0,0 +1,83 @@
+"""
+Rate Limiter Tests
+In-memory token buckets: limits, LRU cap and idle sweep
+"""
+import pytest
+from unittest.mock import patch
+
+from src.security import rate_limiter as rl
+from src.security.rate_limiter import RateLimiter
+
+ENDPOINT = "/api/v1/transaction/send"
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    """In-memory limiter regardless of REDIS_URL"""
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    return RateLimiter()
+
+
+class TestTokenBucket:
+    """Test per-endpoint limits"""
+    
+    def test_denies_after_limit(self, limiter):
+        """The endpoint limit is enforced per IP"""
+        limit = limiter.limits[ENDPOINT]
+        with patch.object(rl.time, "monotonic", return_value=1000.0):
+            results = [limiter.is_allowed("1.1.1.1", ENDPOINT)[0] for _ in range(limit + 1)]
+            other_ip, _ = limiter.is_allowed("2.2.2.2", ENDPOINT)
+        
+        assert results == [True] * limit + [False]
+        assert other_ip
+    
+    def test_refills_over_time(self, limiter):
+        """A drained bucket allows requests again after refilling"""
+        limit = limiter.limits[ENDPOINT]
+        with patch.object(rl.time, "monotonic", return_value=1000.0):
+            for _ in range(limit):
+                limiter.is_allowed("1.1.1.1", ENDPOINT)
+            allowed, info = limiter.is_allowed("1.1.1.1", ENDPOINT)
+        assert not allowed
+        assert info["retry_after"] >= 0
+        
+        with patch.object(rl.time, "monotonic", return_value=1000.0 + 60.0 / limit):
+            allowed, _ = limiter.is_allowed("1.1.1.1", ENDPOINT)
+        assert allowed
+
+
+class TestBucketEviction:
+    """Test that bucket storage stays bounded"""
+    
+    def test_lru_cap_evicts_least_recently_used(self, limiter, monkeypatch):
+        """Past MAX_BUCKETS the least recently used bucket is dropped"""
+        monkeypatch.setattr(rl, "MAX_BUCKETS", 3)
+        with patch.object(rl.time, "monotonic", return_value=1000.0):
+            for ip in ("a", "b", "c"):
+                limiter.is_allowed(ip, ENDPOINT)
+            limiter.is_allowed("a", ENDPOINT)  # "a" is now most recently used
+            limiter.is_allowed("d", ENDPOINT)
+        
+        assert set(limiter.buckets) == {("a", ENDPOINT), ("c", ENDPOINT), ("d", ENDPOINT)}
+    
+    def test_sweep_drops_idle_buckets(self, limiter, monkeypatch):
+        """Every SWEEP_EVERY_CALLS checks, buckets idle past BUCKET_IDLE_SECONDS go"""
+        monkeypatch.setattr(rl, "SWEEP_EVERY_CALLS", 3)
+        with patch.object(rl.time, "monotonic", return_value=1000.0):
+            limiter.is_allowed("idle", ENDPOINT)
+        with patch.object(rl.time, "monotonic", return_value=1000.0 + rl.BUCKET_IDLE_SECONDS + 1):
+            limiter.is_allowed("active", ENDPOINT)
+            limiter.is_allowed("active", ENDPOINT)
+        
+        assert ("idle", ENDPOINT) not in limiter.buckets
+        assert ("active", ENDPOINT) in limiter.buckets
+    
+    def test_reset_ip_drops_only_that_ip(self, limiter):
+        """reset_ip clears every bucket of one IP"""
+        limiter.is_allowed("1.1.1.1", ENDPOINT)
+        limiter.is_allowed("1.1.1.1", "/api/v1/ai/parse")
+        limiter.is_allowed("2.2.2.2", ENDPOINT)
+        
+        limiter.reset_ip("1.1.1.1")
+        
+        assert list(limiter.buckets) == [("2.2.2.2", ENDPOINT)]
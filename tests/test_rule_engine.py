@@ -0,0 +1,169 @@
+"""
+Rule Engine Tests
+Compiled rule evaluation against the reference Rule.check
+"""
+import random
+import pytest
+
+from src.execution.audit_logger import AuditLogger
+from src.rules.rule_engine import (
+    Rule,
+    RuleAction,
+    RuleEngine,
+    RuleType,
+    _compile_rules,
+    _normalize_transaction,
+    _ACTION_ALLOW,
+    _ACTION_DENY,
+)
+
+ADDRESSES = [f"0x{i:040x}" for i in range(1, 6)]
+LIMIT_TYPES = ["daily", "weekly", "monthly", "per_transaction"]
+
+
+def random_rule(rng: random.Random, rule_id: int) -> Rule:
+    """Build a rule of a random type with random parameters and action"""
+    rule_type = rng.choice(list(RuleType)).value
+    if rule_type == RuleType.SPENDING_LIMIT.value:
+        parameters = {"amount": rng.choice([0, 0.5, 1, 2.5, 10]), "type": rng.choice(LIMIT_TYPES)}
+    elif rule_type in (RuleType.ADDRESS_WHITELIST.value, RuleType.ADDRESS_BLACKLIST.value):
+        parameters = {"addresses": [a.upper().replace("0X", "0x") for a in rng.sample(ADDRESSES, 2)]}
+    elif rule_type == RuleType.TIME_RESTRICTION.value:
+        start = rng.randrange(24)
+        parameters = {"allowed_hours": f"{start:02d}:00-{rng.randrange(start, 24):02d}:59"}
+    elif rule_type == RuleType.AMOUNT_THRESHOLD.value:
+        parameters = {"threshold": rng.choice([0, 0.1, 1, 5])}
+    else:
+        parameters = {"max_count": rng.choice([0, 1, 3, 10])}
+    
+    return Rule(
+        rule_id=rule_id,
+        rule_type=rule_type,
+        rule_name=f"rule_{rule_id}",
+        parameters=parameters,
+        action=rng.choice(list(RuleAction)).value
+    )
+
+
+def random_case(rng: random.Random):
+    """Random normalized transaction and sender context"""
+    tx = _normalize_transaction({
+        "from_address": ADDRESSES[0],
+        "to_address": rng.choice(ADDRESSES),
+        "value": rng.choice([0, 0.05, 1, 2.5, 7, 20])
+    })
+    context = {
+        "daily_spending": rng.choice([0, 0.5, 3]),
+        "weekly_spending": rng.choice([0, 1, 8]),
+        "monthly_spending": rng.choice([0, 2, 15]),
+        "daily_transaction_count": rng.randrange(12)
+    }
+    return tx, context
+
+
+def reference(rules, tx, context):
+    """Outcomes and combined action code per Rule.check"""
+    outcomes = [rule.check(tx, context) for rule in rules]
+    action = max(
+        (rule._action_code for rule, (passed, _) in zip(rules, outcomes) if not passed),
+        default=_ACTION_ALLOW
+    )
+    return outcomes, action
+
+
+class TestCompiledRules:
+    """Test that _compile_rules matches Rule.check"""
+    
+    @pytest.mark.parametrize("seed", range(20))
+    def test_matches_rule_check(self, seed):
+        """Randomized rule sets produce the same outcomes, reasons and action"""
+        rng = random.Random(seed)
+        rules = [random_rule(rng, i) for i in range(rng.randrange(1, 8))]
+        
+        for _ in range(25):
+            tx, context = random_case(rng)
+            check_all = _compile_rules(rules, lambda _tx: context)
+            
+            outcomes, action, _, short_circuited = check_all(tx, None, False)
+            
+            assert (outcomes, action) == reference(rules, tx, context)
+            assert not short_circuited
+    
+    @pytest.mark.parametrize("seed", range(10))
+    def test_short_circuit_stops_at_first_deny(self, seed):
+        """Short-circuiting evaluates exactly the prefix up to the first failed DENY"""
+        rng = random.Random(1000 + seed)
+        rules = [random_rule(rng, i) for i in range(rng.randrange(1, 8))]
+        
+        for _ in range(25):
+            tx, context = random_case(rng)
+            check_all = _compile_rules(rules, lambda _tx: context)
+            full, _ = reference(rules, tx, context)
+            
+            outcomes, action, _, short_circuited = check_all(tx, None, True)
+            
+            first_deny = next(
+                (i for i, (rule, (passed, _)) in enumerate(zip(rules, full))
+                 if not passed and rule._action_code == _ACTION_DENY),
+                None
+            )
+            if first_deny is None:
+                assert outcomes == full
+                assert not short_circuited
+            else:
+                assert outcomes == full[:first_deny + 1]
+                assert action == _ACTION_DENY
+                assert short_circuited
+    
+    def test_context_loaded_only_when_needed(self):
+        """Rules that ignore sender history never trigger a context query"""
+        rules = [
+            Rule(1, RuleType.ADDRESS_BLACKLIST.value, "bl", {"addresses": [ADDRESSES[1]]}, RuleAction.DENY.value),
+            Rule(2, RuleType.AMOUNT_THRESHOLD.value, "thr", {"threshold": 5}, RuleAction.REQUIRE_APPROVAL.value),
+        ]
+        
+        def load(_tx):
+            raise AssertionError("context should not be loaded")
+        
+        tx = _normalize_transaction({"to_address": ADDRESSES[2], "value": 1})
+        outcomes, action, ctx, _ = _compile_rules(rules, load)(tx, None, False)
+        
+        assert all(passed for passed, _ in outcomes)
+        assert action == _ACTION_ALLOW
+        assert ctx is None
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """RuleEngine over a temporary database, with the audit log's transactions table"""
+    db_path = str(tmp_path / "rules.db")
+    AuditLogger(db_path=db_path)
+    return RuleEngine(db_path=db_path)
+
+
+class TestRuleEngineReporting:
+    """Test evaluation results reported by RuleEngine"""
+    
+    def test_failures_reported_in_priority_order(self, engine):
+        """A contextual rule of higher priority is reported before context-free ones"""
+        engine.create_rule(RuleType.DAILY_TRANSACTION_COUNT.value, "count", {"max_count": 0}, RuleAction.REQUIRE_APPROVAL.value, priority=10)
+        engine.create_rule(RuleType.AMOUNT_THRESHOLD.value, "thr", {"threshold": 0}, RuleAction.REQUIRE_APPROVAL.value, priority=5)
+        
+        result = engine.evaluate_transaction({"from_address": ADDRESSES[0], "to_address": ADDRESSES[1], "value": 1})
+        rows = engine._conn.execute("SELECT rule_name FROM rule_evaluations ORDER BY id").fetchall()
+        
+        assert result["failed_rules"] == ["count", "thr"]
+        assert [row["rule_name"] for row in rows] == ["count", "thr"]
+    
+    def test_context_skipped_when_risk_level_is_settled(self, engine, monkeypatch):
+        """Frequency cannot change the level of a small transaction with no failures"""
+        engine.create_rule(RuleType.AMOUNT_THRESHOLD.value, "thr", {"threshold": 5}, RuleAction.REQUIRE_APPROVAL.value)
+        
+        def load(_tx):
+            raise AssertionError("context should not be loaded")
+        
+        monkeypatch.setattr(engine, "_build_context", load)
+        result = engine.evaluate_transaction({"from_address": ADDRESSES[0], "to_address": ADDRESSES[1], "value": 0.01})
+        
+        assert result["allowed"]
+        assert result["risk_level"] == "low"
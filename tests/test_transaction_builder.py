@@ -0,0 +1,86 @@
+"""
+Transaction Builder Tests
+Local nonce management and contract detection caching
+"""
+import pytest
+from unittest.mock import Mock, patch
+
+pytest.importorskip("web3")
+
+from src.execution.transaction_builder import TransactionBuilder, EOA_CACHE_TTL
+
+SENDER = "0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb7"
+
+
+@pytest.fixture
+def w3():
+    """Mock Web3 instance"""
+    mock = Mock()
+    mock.eth.get_transaction_count.return_value = 7
+    return mock
+
+
+@pytest.fixture
+def builder(w3):
+    """TransactionBuilder over a mocked Web3Manager"""
+    web3_manager = Mock()
+    web3_manager.acquire.return_value = w3
+    return TransactionBuilder(web3_manager)
+
+
+class TestNonceCache:
+    """Test local nonce reservation"""
+    
+    def test_nonce_fetched_once_then_incremented(self, builder, w3):
+        """Consecutive reservations increment locally without an RPC"""
+        assert builder.get_nonce(SENDER) == 7
+        assert builder.get_nonce(SENDER) == 8
+        assert builder.get_nonce(SENDER.lower()) == 9
+        assert w3.eth.get_transaction_count.call_count == 1
+    
+    def test_reset_nonce_resyncs_from_node(self, builder, w3):
+        """After reset_nonce the next reservation refetches the count"""
+        builder.get_nonce(SENDER)
+        builder.get_nonce(SENDER)
+        
+        builder.reset_nonce(SENDER)
+        w3.eth.get_transaction_count.return_value = 8
+        
+        assert builder.get_nonce(SENDER) == 8
+        assert w3.eth.get_transaction_count.call_count == 2
+    
+    def test_nonces_tracked_per_sender(self, builder, w3):
+        """Each sender has its own counter"""
+        other = "0x0000000000000000000000000000000000000001"
+        assert builder.get_nonce(SENDER) == 7
+        assert builder.get_nonce(other) == 7
+        assert builder.get_nonce(SENDER) == 8
+
+
+class TestContractDetection:
+    """Test the eth_getCode cache"""
+    
+    RECIPIENT = "0x0000000000000000000000000000000000000002"
+    
+    def test_contract_cached_for_good(self, builder, w3):
+        """An address with code is looked up once"""
+        w3.eth.get_code.return_value = b"\x60\x80"
+        
+        assert builder._is_contract(self.RECIPIENT) is True
+        with patch("src.execution.transaction_builder.time.monotonic", return_value=1e9):
+            assert builder._is_contract(self.RECIPIENT) is True
+        assert w3.eth.get_code.call_count == 1
+    
+    def test_eoa_rechecked_after_ttl(self, builder, w3):
+        """An address without code is trusted only for EOA_CACHE_TTL"""
+        w3.eth.get_code.return_value = b""
+        
+        with patch("src.execution.transaction_builder.time.monotonic", return_value=100.0):
+            assert builder._is_contract(self.RECIPIENT) is False
+            assert builder._known_simple_transfer(self.RECIPIENT, "0x", None)
+        
+        w3.eth.get_code.return_value = b"\x60\x80"
+        with patch("src.execution.transaction_builder.time.monotonic", return_value=100.0 + EOA_CACHE_TTL):
+            assert not builder._known_simple_transfer(self.RECIPIENT, "0x", None)
+            assert builder._is_contract(self.RECIPIENT) is True
+        assert w3.eth.get_code.call_count == 2
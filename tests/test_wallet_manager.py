@@ -0,0 +1,157 @@
+"""
+Wallet Manager Tests
+Encrypted wallet formats: current AES-GCM files and older Fernet files
+"""
+import base64
+import hashlib
+import json
+import pytest
+from unittest.mock import Mock
+
+pytest.importorskip("eth_account")
+pytest.importorskip("cryptography")
+
+from eth_account import Account
+from cryptography.fernet import Fernet
+
+from src.execution.secure_execution import WalletManager, WALLET_CIPHER, WALLET_VERSION
+
+PASSWORD = "test-password"
+PRIVATE_KEY = "11" * 32
+ADDRESS = Account.from_key(bytes.fromhex(PRIVATE_KEY)).address
+
+
+@pytest.fixture
+def wallet_manager(tmp_path, monkeypatch):
+    """WalletManager over a temporary wallet directory"""
+    monkeypatch.setenv("WALLET_PASSWORD", PASSWORD)
+    web3_manager = Mock()
+    web3_manager.network = "sepolia"
+    return WalletManager(web3_manager, wallet_dir=str(tmp_path))
+
+
+def fresh_manager(wallet_manager):
+    """A second manager on the same directory, with an empty key cache"""
+    return WalletManager(wallet_manager.web3_manager, wallet_dir=str(wallet_manager.wallet_dir))
+
+
+def write_wallet(wallet_manager, name, wallet_data):
+    """Write a hand-built wallet file, as an earlier version would have"""
+    (wallet_manager.wallet_dir / f"{name}.json").write_text(json.dumps(wallet_data))
+
+
+class TestCurrentFormat:
+    """Test version 3.0 (scrypt + AES-256-GCM) wallets"""
+    
+    def test_create_and_reload(self, wallet_manager):
+        """A created wallet reloads to the same address in a new manager"""
+        created = wallet_manager.create_wallet("main")
+        
+        wallet_data = json.loads((wallet_manager.wallet_dir / "main.json").read_text())
+        assert wallet_data["version"] == WALLET_VERSION
+        assert wallet_data["cipher"] == WALLET_CIPHER
+        
+        loaded = fresh_manager(wallet_manager).load_wallet("main")
+        assert loaded["address"] == created["address"]
+    
+    def test_import_roundtrip(self, wallet_manager):
+        """An imported key decrypts back to the same bytes"""
+        wallet_manager.import_wallet("imported", "0x" + PRIVATE_KEY)
+        
+        other = fresh_manager(wallet_manager)
+        other.load_wallet("imported")
+        
+        assert other.current_wallet_address == ADDRESS
+        assert other._pending_pk == bytes.fromhex(PRIVATE_KEY)
+    
+    def test_tampered_wallet_rejected_on_load(self, wallet_manager):
+        """The GCM tag catches a modified ciphertext at load time"""
+        wallet_manager.import_wallet("tampered", PRIVATE_KEY)
+        path = wallet_manager.wallet_dir / "tampered.json"
+        wallet_data = json.loads(path.read_text())
+        ciphertext = bytearray(base64.b64decode(wallet_data["encrypted_private_key"]))
+        ciphertext[0] ^= 1
+        wallet_data["encrypted_private_key"] = base64.b64encode(bytes(ciphertext)).decode()
+        path.write_text(json.dumps(wallet_data))
+        
+        with pytest.raises(Exception):
+            fresh_manager(wallet_manager).load_wallet("tampered")
+    
+    def test_edited_address_rejected_before_signing(self, wallet_manager):
+        """The stored address is not covered by the GCM tag; signing checks it"""
+        wallet_manager.import_wallet("edited", PRIVATE_KEY)
+        path = wallet_manager.wallet_dir / "edited.json"
+        wallet_data = json.loads(path.read_text())
+        wallet_data["address"] = "0x0000000000000000000000000000000000000001"
+        path.write_text(json.dumps(wallet_data))
+        
+        other = fresh_manager(wallet_manager)
+        other.load_wallet("edited")
+        
+        with pytest.raises(ValueError, match="Address mismatch"):
+            other.sign_transaction({"to": ADDRESS, "value": 0})
+        assert other.current_wallet is None
+    
+    def test_wrong_password_rejected_on_load(self, wallet_manager, monkeypatch):
+        """Loading with a different master password fails"""
+        wallet_manager.import_wallet("main", PRIVATE_KEY)
+        
+        monkeypatch.setenv("WALLET_PASSWORD", "not-the-password")
+        with pytest.raises(Exception):
+            fresh_manager(wallet_manager).load_wallet("main")
+
+
+class TestLegacyFormats:
+    """Test that wallets written by earlier versions still load"""
+    
+    def test_version_1_pbkdf2_fernet(self, wallet_manager):
+        """1.0: PBKDF2 key, base64 salt, Fernet over the 0x-prefixed hex key"""
+        salt = b"\x01" * 16
+        key = hashlib.pbkdf2_hmac("sha256", PASSWORD.encode(), salt, 100000, dklen=32)
+        encrypted = Fernet(base64.urlsafe_b64encode(key)).encrypt(("0x" + PRIVATE_KEY).encode())
+        write_wallet(wallet_manager, "v1", {
+            "address": ADDRESS,
+            "encrypted_private_key": encrypted.decode(),
+            "salt": base64.b64encode(salt).decode(),
+            "version": "1.0"
+        })
+        
+        loaded = wallet_manager.load_wallet("v1")
+        
+        assert loaded["address"] == ADDRESS
+        assert wallet_manager.current_wallet.address == ADDRESS
+    
+    def test_version_2_scrypt_fernet(self, wallet_manager):
+        """2.0: scrypt key, base64 salt, Fernet over the hex key"""
+        salt = b"\x02" * 16
+        params = {"n": 2 ** 10, "r": 8, "p": 1}
+        key = hashlib.scrypt(PASSWORD.encode(), salt=salt, dklen=32, **params)
+        encrypted = Fernet(base64.urlsafe_b64encode(key)).encrypt(PRIVATE_KEY.encode())
+        write_wallet(wallet_manager, "v2", {
+            "address": ADDRESS,
+            "encrypted_private_key": encrypted.decode(),
+            "salt": base64.b64encode(salt).decode(),
+            "version": "2.0",
+            "kdf": "scrypt",
+            **params
+        })
+        
+        loaded = wallet_manager.load_wallet("v2")
+        
+        assert loaded["address"] == ADDRESS
+        assert wallet_manager.current_wallet.address == ADDRESS
+    
+    def test_legacy_address_mismatch_rejected(self, wallet_manager):
+        """Fernet wallets are checked against their stored address"""
+        salt = b"\x03" * 16
+        key = hashlib.pbkdf2_hmac("sha256", PASSWORD.encode(), salt, 100000, dklen=32)
+        encrypted = Fernet(base64.urlsafe_b64encode(key)).encrypt(PRIVATE_KEY.encode())
+        write_wallet(wallet_manager, "mismatch", {
+            "address": "0x0000000000000000000000000000000000000001",
+            "encrypted_private_key": encrypted.decode(),
+            "salt": base64.b64encode(salt).decode(),
+            "version": "1.0"
+        })
+        
+        with pytest.raises(ValueError):
+            wallet_manager.load_wallet("mismatch")
@@ -0,0 +1,187 @@
+"""
+Web3 Connection Tests
+Unit conversion and JSON-RPC batching helpers
+"""
+import asyncio
+import pytest
+from decimal import Decimal
+from unittest.mock import AsyncMock, Mock, patch
+
+pytest.importorskip("web3")
+
+import requests
+
+from src.execution.web3_connection import (
+    Web3Manager,
+    ResilientHTTPProvider,
+    WEI_PER_ETHER,
+    RPC_MAX_ATTEMPTS,
+    GAS_RESUBSCRIBE_DELAY,
+)
+
+
+class TestUnitConversion:
+    """Test ether/wei conversion"""
+    
+    def test_float_ether_to_wei_is_exact(self):
+        """Floats convert by their decimal repr, not their binary value"""
+        assert Web3Manager.ether_to_wei(None, 1.1) == 1_100_000_000_000_000_000
+        assert Web3Manager.ether_to_wei(None, 0.001) == 1_000_000_000_000_000
+        assert Web3Manager.ether_to_wei(None, 0.3) == 300_000_000_000_000_000
+    
+    def test_int_decimal_and_str_ether_to_wei(self):
+        """Exact types convert exactly"""
+        assert Web3Manager.ether_to_wei(None, 2) == 2 * WEI_PER_ETHER
+        assert Web3Manager.ether_to_wei(None, Decimal("1.000000000000000001")) == WEI_PER_ETHER + 1
+        assert Web3Manager.ether_to_wei(None, "0.5") == WEI_PER_ETHER // 2
+
+
+class TestResilientHTTPProvider:
+    """Test the single RPC retry layer"""
+    
+    @pytest.fixture
+    def provider(self):
+        return ResilientHTTPProvider("http://localhost:8545")
+    
+    def test_broadcast_is_never_retried(self, provider):
+        """A failed eth_sendRawTransaction is raised after one attempt"""
+        send = Mock(side_effect=requests.exceptions.ConnectionError("reset"))
+        with patch("src.execution.web3_connection.time.sleep") as sleep:
+            with pytest.raises(requests.exceptions.ConnectionError):
+                provider._with_retries("eth_sendRawTransaction", send)
+        assert send.call_count == 1
+        sleep.assert_not_called()
+    
+    def test_reads_retry_with_backoff(self, provider):
+        """Idempotent reads are retried until the attempt budget runs out"""
+        send = Mock(side_effect=requests.exceptions.Timeout("slow"))
+        with patch("src.execution.web3_connection.time.sleep") as sleep:
+            with pytest.raises(requests.exceptions.Timeout):
+                provider._with_retries("eth_call", send)
+        assert send.call_count == RPC_MAX_ATTEMPTS
+        assert sleep.call_count == RPC_MAX_ATTEMPTS - 1
+    
+    def test_client_errors_not_retried(self, provider):
+        """A 4xx other than 429 is raised at once and does not trip the breaker"""
+        error = requests.exceptions.HTTPError("not found", response=Mock(status_code=404))
+        send = Mock(side_effect=error)
+        with patch("src.execution.web3_connection.time.sleep"):
+            with pytest.raises(requests.exceptions.HTTPError):
+                provider._with_retries("eth_call", send)
+        assert send.call_count == 1
+        assert not provider._failures
+    
+    def test_rate_limit_and_server_errors_retried(self, provider):
+        """429 and 5xx responses are retried"""
+        send = Mock(side_effect=[
+            requests.exceptions.HTTPError("busy", response=Mock(status_code=429)),
+            requests.exceptions.HTTPError("down", response=Mock(status_code=503)),
+            {"result": "0x1"},
+        ])
+        with patch("src.execution.web3_connection.time.sleep"):
+            assert provider._with_retries("eth_call", send) == {"result": "0x1"}
+        assert send.call_count == 3
+    
+    def test_web3_retry_layer_disabled(self, provider):
+        """web3's own exception retries do not stack on top"""
+        assert provider.exception_retry_configuration is None
+
+
+class TestBatchCall:
+    """Test JSON-RPC batch result handling"""
+    
+    @pytest.fixture
+    def manager(self):
+        manager = Web3Manager.__new__(Web3Manager)
+        manager.is_connected = Mock(return_value=True)
+        manager.acquire = Mock()
+        return manager
+    
+    def _reply(self, manager, responses):
+        manager.acquire.return_value.provider.make_batch_request.return_value = responses
+    
+    def test_results_in_order(self, manager):
+        """Each call gets its own result, in call order"""
+        self._reply(manager, [{"id": 0, "result": "0x1"}, {"id": 1, "result": "0x2"}])
+        
+        results = manager.batch_call([("eth_getBalance", ["0xa", "latest"]), ("eth_chainId", [])])
+        
+        assert results == ["0x1", "0x2"]
+    
+    def test_failed_entry_yields_value_error(self, manager):
+        """A per-call error does not fail the rest of the batch"""
+        self._reply(manager, [
+            {"id": 0, "error": {"code": -32000, "message": "boom"}},
+            {"id": 1, "result": "0x2"},
+        ])
+        
+        results = manager.batch_call([("eth_call", [{}]), ("eth_chainId", [])])
+        
+        assert isinstance(results[0], ValueError)
+        assert results[1] == "0x2"
+    
+    def test_whole_batch_error_fails_every_call(self, manager):
+        """A single error object for the batch becomes one ValueError per call"""
+        self._reply(manager, {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "batch too large"}})
+        
+        results = manager.batch_call([("eth_chainId", []), ("eth_gasPrice", []), ("eth_blockNumber", [])])
+        
+        assert len(results) == 3
+        assert all(isinstance(result, ValueError) for result in results)
+    
+    def test_short_reply_fails_missing_calls(self, manager):
+        """Calls missing from the reply fail instead of being dropped"""
+        self._reply(manager, [{"id": 0, "result": "0x1"}])
+        
+        results = manager.batch_call([("eth_chainId", []), ("eth_gasPrice", [])])
+        
+        assert results[0] == "0x1"
+        assert isinstance(results[1], ValueError)
+
+
+class TestGasSubscription:
+    """Test the newHeads gas price subscription"""
+    
+    def test_resubscribes_after_failure(self):
+        """A failed subscription is retried instead of ending the task"""
+        manager = Web3Manager.__new__(Web3Manager)
+        manager.rpc_url = "wss://localhost:8546"
+        manager._fee_cache = None
+        manager._pushed_gas_price = None
+        
+        async_w3 = Mock()
+        async_w3.provider.is_connected = AsyncMock(return_value=True)
+        async_w3.eth.subscribe = AsyncMock(side_effect=[ConnectionError("socket closed"), "0x1"])
+        
+        async def heads():
+            yield {"number": 1}
+            raise asyncio.CancelledError
+        
+        async_w3.socket.process_subscriptions = heads
+        manager.async_w3 = async_w3
+        
+        async def run():
+            gas_price = asyncio.get_running_loop().create_future()
+            gas_price.set_result(30_000_000_000)
+            async_w3.eth.gas_price = gas_price
+            with patch("src.execution.web3_connection.asyncio.sleep", new=AsyncMock()) as sleep:
+                with pytest.raises(asyncio.CancelledError):
+                    await manager.subscribe_gas_updates()
+            return sleep
+        
+        sleep = asyncio.run(run())
+        
+        assert async_w3.eth.subscribe.await_count == 2
+        sleep.assert_awaited_once_with(GAS_RESUBSCRIBE_DELAY)
+        assert manager._pushed_gas_price[0] == 30_000_000_000
+    
+    def test_done_callback_logs_failure(self):
+        """A subscription task that dies with an error is logged"""
+        task = Mock()
+        task.cancelled.return_value = False
+        task.exception.return_value = RuntimeError("boom")
+        
+        with patch("src.execution.web3_connection.logger") as log:
+            Web3Manager._on_gas_task_done(task)
+        
+        log.error.assert_called_once()